@@ -0,0 +1,210 @@
+"""
+Módulo de Montagem de Múltiplas
+Busca combinações de seleções dos jogos do dia que maximizam o valor
+esperado ou a probabilidade de acerto, respeitando número de pernas,
+odd mínima e ligas, com beam search e branch-and-bound por limites otimistas
+"""
+
+import heapq
+import itertools
+import math
+from typing import Dict, Iterable, List, Optional
+
+from refresh_scheduler import FINISHED_STATUSES, LIVE_STATUSES, match_key
+
+OBJECTIVES = ('ev', 'prob')
+
+OUTCOME_KEYS = (
+    ('home', 'home_win'),
+    ('draw', 'draw'),
+    ('away', 'away_win'),
+)
+
+
+class Selection:
+    """Uma seleção possível: um resultado de um jogo com sua odd e probabilidade"""
+
+    __slots__ = ('match', 'outcome', 'probability', 'odd', 'score', 'log_odd')
+
+    def __init__(self, match: Dict, outcome: str, probability: float, odd: float):
+        self.match = match
+        self.outcome = outcome
+        self.probability = probability
+        self.odd = odd
+        self.score = 0.0
+        self.log_odd = math.log(odd)
+
+    def label(self) -> str:
+        """Descrição da seleção para exibição"""
+        if self.outcome == 'home':
+            return f"Vitória {self.match.get('home_team', 'Time A')}"
+        if self.outcome == 'away':
+            return f"Vitória {self.match.get('away_team', 'Time B')}"
+        return "Empate"
+
+
+def build_selections(predictions: Iterable[Dict], leagues: Optional[Iterable[str]] = None) -> List[Selection]:
+    """
+    Gera as seleções possíveis a partir das previsões do dia
+
+    Args:
+        predictions: Jogos com odds e probabilidades (get_match_predictions)
+        leagues: Ligas permitidas (None ou vazio = todas)
+
+    Returns:
+        Uma seleção por resultado de cada jogo ainda não iniciado com odd e
+        probabilidade válidas
+    """
+    leagues = set(leagues or ())
+    selections = []
+    for match in predictions:
+        if leagues and match.get('league') not in leagues:
+            continue
+        # Jogos em andamento ou encerrados não podem entrar na múltipla
+        status = (match.get('status') or 'scheduled').lower()
+        if status in LIVE_STATUSES or status in FINISHED_STATUSES:
+            continue
+        odds = match.get('odds') or {}
+        probability = match.get('probability') or {}
+        for outcome, probability_key in OUTCOME_KEYS:
+            try:
+                odd = float(odds[outcome])
+                prob = float(probability[probability_key]) / 100
+            except (KeyError, TypeError, ValueError):
+                continue
+            if odd > 1.0 and prob > 0:
+                selections.append(Selection(match, outcome, prob, odd))
+    return selections
+
+
+def build_accumulator(selections: List[Selection], legs: int, min_odds: float = 1.0,
+                      objective: str = 'prob', beam_width: int = 64,
+                      node_limit: Optional[int] = 200_000) -> Optional[Dict]:
+    """
+    Monta a melhor múltipla com exatamente `legs` pernas
+
+    As seleções são ordenadas pela contribuição de cada perna ao objetivo
+    (log da probabilidade ou log de probabilidade x odd). Primeiro um beam
+    search perna a perna mantém os `beam_width` melhores parciais,
+    ranqueados por um limite otimista (valor atual + melhores pernas
+    restantes). Esse limite ignora a odd mínima, então o beam sozinho pode
+    perder o ótimo; por isso a solução dele serve de ponto de partida para
+    um branch-and-bound em profundidade, que descarta ramos cujo limite
+    otimista não supera a melhor múltipla encontrada e ramos que nem com as
+    maiores odds restantes alcançam a odd mínima. Se a busca exata esgota
+    `node_limit` passos, fica a melhor múltipla encontrada até ali
+    (`exact` = False no resultado).
+
+    Args:
+        selections: Seleções candidatas (build_selections)
+        legs: Número de pernas
+        min_odds: Odd total mínima
+        objective: 'prob' (probabilidade de acerto) ou 'ev' (valor esperado)
+        beam_width: Parciais mantidos por nível do beam search
+        node_limit: Passos máximos da busca exata (None = sem limite)
+
+    Returns:
+        Dicionário com seleções, odd total, probabilidade, valor esperado e
+        se o ótimo foi comprovado, ou None se nenhuma combinação atende às
+        restrições
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Objetivo inválido: {objective}")
+    if legs < 1 or len(selections) < legs:
+        return None
+
+    for selection in selections:
+        selection.score = math.log(selection.probability)
+        if objective == 'ev':
+            selection.score += selection.log_odd
+    ordered = sorted(selections, key=lambda s: s.score, reverse=True)
+    keys = [match_key(s.match) for s in ordered]
+    n = len(ordered)
+
+    # prefix[i] = soma dos scores de ordered[:i]
+    prefix = [0.0]
+    for selection in ordered:
+        prefix.append(prefix[-1] + selection.score)
+
+    # best_odds[i][k] = soma dos k maiores log-odds em ordered[i:]
+    best_odds = [[0.0] + [-math.inf] * (legs - 1)] * (n + 1)
+    top: List[float] = []
+    for i in range(n - 1, -1, -1):
+        top = heapq.nlargest(legs - 1, top + [ordered[i].log_odd])
+        sums = [0.0]
+        for value in top:
+            sums.append(sums[-1] + value)
+        best_odds[i] = sums + [-math.inf] * (legs - len(sums))
+    log_min_odds = math.log(min_odds) if min_odds > 1 else 0.0
+
+    def optimistic(index: int, score: float, remaining: int) -> float:
+        end = min(n, index + 1 + remaining)
+        return score + prefix[end] - prefix[index + 1]
+
+    # Beam search: parcial = (score, log_odd, último índice, jogos usados, seleções)
+    beam = [(0.0, 0.0, -1, frozenset(), ())]
+    tiebreak = itertools.count()
+    for depth in range(legs):
+        remaining = legs - depth - 1
+        children: List = []
+        for score, log_odd, last, used, picks in beam:
+            for j in range(last + 1, n - remaining):
+                candidate = ordered[j]
+                child_score = score + candidate.score
+                bound = optimistic(j, child_score, remaining)
+                if len(children) >= beam_width and bound <= children[0][0]:
+                    break
+                if keys[j] in used:
+                    continue
+                child_odd = log_odd + candidate.log_odd
+                if child_odd + best_odds[j + 1][remaining] < log_min_odds - 1e-12:
+                    continue
+                state = (child_score, child_odd, j, used | {keys[j]}, picks + (candidate,))
+                entry = (bound, next(tiebreak), state)
+                if len(children) < beam_width:
+                    heapq.heappush(children, entry)
+                else:
+                    heapq.heapreplace(children, entry)
+        if not children:
+            beam = []
+            break
+        beam = [state for _, _, state in sorted(children, reverse=True)]
+
+    # Branch-and-bound a partir da melhor múltipla do beam
+    best_score, best_picks = (beam[0][0], beam[0][4]) if beam else (-math.inf, None)
+    budget = [math.inf if node_limit is None else node_limit]
+
+    def search(start: int, remaining: int, score: float, log_odd: float, used: set, picks: tuple) -> None:
+        nonlocal best_score, best_picks
+        for j in range(start, n - remaining + 1):
+            budget[0] -= 1
+            # Scores em ordem decrescente: o limite só cai ao avançar j
+            if budget[0] < 0 or score + prefix[j + remaining] - prefix[j] <= best_score:
+                return
+            if keys[j] in used:
+                continue
+            candidate = ordered[j]
+            child_odd = log_odd + candidate.log_odd
+            if child_odd + best_odds[j + 1][remaining - 1] < log_min_odds - 1e-12:
+                continue
+            if remaining == 1:
+                # As próximas seleções têm score menor: nada melhor neste nível
+                best_score, best_picks = score + candidate.score, picks + (candidate,)
+                return
+            used.add(keys[j])
+            search(j + 1, remaining - 1, score + candidate.score, child_odd, used, picks + (candidate,))
+            used.discard(keys[j])
+
+    search(0, legs, 0.0, 0.0, set(), ())
+    if best_picks is None:
+        return None
+
+    probability = math.prod(s.probability for s in best_picks)
+    total_odds = math.prod(s.odd for s in best_picks)
+    return {
+        'selections': list(best_picks),
+        'odds': round(total_odds, 2),
+        'probability': round(probability * 100, 2),
+        'expected_value': round((probability * total_odds - 1) * 100, 2),
+        'exact': budget[0] >= 0,
+    }
@@ -0,0 +1,275 @@
+"""
+Módulo de Backtesting dos Modelos de Probabilidade
+Reprocessa jogos históricos (odds + resultados) por qualquer motor de
+probabilidade e mede Brier score, log-loss, calibração e ROI simulado
+
+Formato dos dados: arquivos JSON Lines (um por temporada), uma linha por jogo:
+    {"league": "LaLiga", "home_team": "...", "away_team": "...",
+     "odds": {"home": 1.95, "draw": 3.60, "away": 3.80}, "result": "home"}
+O resultado também pode ser informado como placar ("score": "2-1").
+
+Uso:
+    python3 backtest.py dados/*.jsonl --workers 4
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ('home', 'draw', 'away')
+PROBABILITY_KEYS = {'home': 'home_win', 'draw': 'draw', 'away': 'away_win'}
+CALIBRATION_BINS = 10
+EPSILON = 1e-15
+
+_scraper = None
+
+
+def scraper_engine(match: Dict) -> Dict:
+    """Motor padrão: FootballScraper.calculate_win_probability (uma instância por processo)"""
+    global _scraper
+    if _scraper is None:
+        from scraper import FootballScraper
+        _scraper = FootballScraper()
+    return _scraper.calculate_win_probability(match)
+
+
+def match_result(match: Dict) -> Optional[str]:
+    """
+    Obtém o resultado de um jogo histórico
+
+    Args:
+        match: Jogo com 'result' (home/draw/away) ou 'score' ("2-1")
+
+    Returns:
+        'home', 'draw', 'away' ou None se o resultado for desconhecido
+    """
+    result = match.get('result')
+    if result in OUTCOMES:
+        return result
+
+    try:
+        home_goals, away_goals = (int(g) for g in str(match['score']).split('-'))
+    except (KeyError, ValueError):
+        return None
+    if home_goals > away_goals:
+        return 'home'
+    if home_goals < away_goals:
+        return 'away'
+    return 'draw'
+
+
+def iter_fixture_chunks(path: str, chunk_size: int = 5000) -> Iterator[List[Dict]]:
+    """
+    Lê um arquivo de temporada em blocos, sem carregá-lo inteiro na memória
+
+    Args:
+        path: Arquivo JSON Lines
+        chunk_size: Jogos por bloco
+
+    Yields:
+        Listas de até chunk_size jogos
+    """
+    chunk = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                chunk.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"{path}:{line_number}: linha inválida ignorada")
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class BacktestMetrics:
+    """Métricas acumuladas de um backtest; blocos parciais podem ser somados"""
+
+    def __init__(self):
+        self.matches = 0
+        self.skipped = 0
+        self.brier_sum = 0.0
+        self.log_loss_sum = 0.0
+        # Por faixa de probabilidade: [previsões, soma das probabilidades, acertos]
+        self.calibration = [[0, 0.0, 0] for _ in range(CALIBRATION_BINS)]
+        self.bets = 0
+        self.staked = 0.0
+        self.returned = 0.0
+
+    def add(self, match: Dict, probability: Dict, min_edge: float = 0.05) -> None:
+        """
+        Contabiliza um jogo
+
+        Args:
+            match: Jogo histórico com odds e resultado
+            probability: Saída do motor (percentuais home_win/draw/away_win)
+            min_edge: Vantagem mínima (p * odd - 1) para simular uma aposta
+        """
+        result = match_result(match)
+        try:
+            probs = {o: float(probability[PROBABILITY_KEYS[o]]) / 100 for o in OUTCOMES}
+        except (KeyError, TypeError, ValueError):
+            probs = None
+        if result is None or probs is None or sum(probs.values()) <= 0:
+            self.skipped += 1
+            return
+
+        self.matches += 1
+        self.brier_sum += sum((probs[o] - (o == result)) ** 2 for o in OUTCOMES)
+        self.log_loss_sum += -math.log(max(probs[result], EPSILON))
+
+        for outcome in OUTCOMES:
+            index = min(int(probs[outcome] * CALIBRATION_BINS), CALIBRATION_BINS - 1)
+            bucket = self.calibration[index]
+            bucket[0] += 1
+            bucket[1] += probs[outcome]
+            bucket[2] += outcome == result
+
+        # Aposta simulada de 1 unidade no resultado com maior valor esperado
+        odds = match.get('odds') or {}
+        edges = {}
+        for outcome in OUTCOMES:
+            try:
+                edges[outcome] = probs[outcome] * float(odds[outcome]) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+        if edges:
+            best = max(edges, key=edges.get)
+            if edges[best] >= min_edge:
+                self.bets += 1
+                self.staked += 1.0
+                if best == result:
+                    self.returned += float(odds[best])
+
+    def merge(self, other: 'BacktestMetrics') -> 'BacktestMetrics':
+        """Soma as métricas de outro bloco a estas"""
+        self.matches += other.matches
+        self.skipped += other.skipped
+        self.brier_sum += other.brier_sum
+        self.log_loss_sum += other.log_loss_sum
+        for mine, theirs in zip(self.calibration, other.calibration):
+            mine[0] += theirs[0]
+            mine[1] += theirs[1]
+            mine[2] += theirs[2]
+        self.bets += other.bets
+        self.staked += other.staked
+        self.returned += other.returned
+        return self
+
+    def summary(self) -> Dict:
+        """
+        Resumo final do backtest
+
+        Returns:
+            Dicionário com Brier score, log-loss, curva de calibração e ROI
+        """
+        n = self.matches
+        return {
+            'matches': n,
+            'skipped': self.skipped,
+            'brier_score': round(self.brier_sum / n, 4) if n else None,
+            'log_loss': round(self.log_loss_sum / n, 4) if n else None,
+            'calibration': [
+                {
+                    'bin': f"{i * 100 // CALIBRATION_BINS}-{(i + 1) * 100 // CALIBRATION_BINS}%",
+                    'predictions': count,
+                    'mean_predicted': round(prob_sum / count, 4),
+                    'observed': round(hits / count, 4),
+                }
+                for i, (count, prob_sum, hits) in enumerate(self.calibration)
+                if count
+            ],
+            'bets': self.bets,
+            'roi': round((self.returned - self.staked) / self.staked * 100, 2) if self.staked else None,
+        }
+
+
+def evaluate_chunk(chunk: List[Dict], engine: Callable[[Dict], Dict] = scraper_engine,
+                   min_edge: float = 0.05) -> BacktestMetrics:
+    """Avalia um bloco de jogos (executado nos processos do pool)"""
+    metrics = BacktestMetrics()
+    for match in chunk:
+        try:
+            probability = engine(match)
+        except Exception as e:
+            logger.warning(f"Erro do motor de probabilidade: {str(e)}")
+            metrics.skipped += 1
+            continue
+        metrics.add(match, probability, min_edge=min_edge)
+    return metrics
+
+
+def run_backtest(paths: Iterable[str], engine: Callable[[Dict], Dict] = scraper_engine,
+                 workers: Optional[int] = None, chunk_size: int = 5000,
+                 min_edge: float = 0.05) -> Dict:
+    """
+    Executa um backtest sobre várias temporadas
+
+    Os blocos são lidos sob demanda e distribuídos por um pool de processos,
+    com no máximo 2 blocos pendentes por processo para limitar a memória.
+
+    Args:
+        paths: Arquivos de temporada (JSON Lines)
+        engine: Função de nível de módulo (serializável) que recebe um jogo
+            e retorna as probabilidades como calculate_win_probability
+        workers: Número de processos (padrão: CPUs; 1 = no processo atual)
+        chunk_size: Jogos por bloco
+        min_edge: Vantagem mínima para simular uma aposta
+
+    Returns:
+        Resumo das métricas (BacktestMetrics.summary)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = (chunk for path in paths for chunk in iter_fixture_chunks(path, chunk_size))
+    total = BacktestMetrics()
+
+    if workers == 1:
+        for chunk in chunks:
+            total.merge(evaluate_chunk(chunk, engine, min_edge))
+        return total.summary()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(evaluate_chunk, chunk, engine, min_edge))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge(future.result())
+        for future in pending:
+            total.merge(future.result())
+
+    return total.summary()
+
+
+def main():
+    """Executa o backtest pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Backtest dos modelos de probabilidade")
+    parser.add_argument('paths', nargs='+', help="Arquivos de temporada (JSON Lines)")
+    parser.add_argument('--workers', type=int, default=None, help="Número de processos")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Jogos por bloco")
+    parser.add_argument('--min-edge', type=float, default=0.05, help="Vantagem mínima para apostar")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    summary = run_backtest(args.paths, workers=args.workers,
+                           chunk_size=args.chunk_size, min_edge=args.min_edge)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
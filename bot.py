@@ -2,10 +2,41 @@ import logging
 import os
 import asyncio
 import json
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler, MessageHandler, filters
-from config import TELEGRAM_BOT_TOKEN
+from datetime import datetime
+from telegram.error import BadRequest
+from telegram import (
+    Update, InlineKeyboardButton, InlineKeyboardMarkup,
+    InlineQueryResultArticle, InputTextMessageContent,
+)
+from telegram.ext import (
+    Application, CommandHandler, ContextTypes, CallbackQueryHandler, MessageHandler,
+    InlineQueryHandler, filters,
+)
+from config import (
+    TELEGRAM_BOT_TOKEN, TELEGRAM_API_BASE_URL, TEAM_ALIASES, INLINE_MAX_RESULTS, INLINE_CACHE_TIME,
+    DIGEST_TIME, DIGEST_RATE_PER_SECOND, DIGEST_WORKERS, DIGEST_SUBSCRIBERS_FILE,
+    DIGEST_CHECKPOINT_FILE, REFRESH_REQUESTS_PER_MINUTE, REFRESH_SYNC_INTERVAL,
+    ACCUMULATOR_DEFAULT_LEGS, ACCUMULATOR_MAX_LEGS, ACCUMULATOR_DEFAULT_MIN_ODDS,
+    ACCUMULATOR_BEAM_WIDTH, SNAPSHOT_FILE, SNAPSHOT_INTERVAL, JOGOS_PAGE_SIZE,
+    JOGOS_RENDER_CACHE_SIZE, IO_WORKERS, IO_QUEUE_LIMIT, CPU_WORKERS, CPU_QUEUE_LIMIT,
+    EXECUTOR_METRICS_INTERVAL, ANALYSIS_TOKEN_BUDGET, ANALYSIS_SUMMARY_TOKENS,
+    ANALYSIS_IDLE_TIMEOUT, ANALYSIS_MAX_SESSIONS,
+)
 from scraper import FootballScraper
+from search_index import TeamSearchIndex
+from refresh_scheduler import RefreshScheduler, match_key
+from accumulator import OBJECTIVES, build_accumulator, build_selections
+from snapshot import load_snapshot, save_snapshot
+from executors import TieredExecutor
+from conversation import ConversationStore
+from pagination import (
+    FILTER_ALL, FILTER_PREFERENCES, LRUCache, decode_callback, navigation_buttons, render_page,
+    sort_matches,
+)
+from digest import (
+    BroadcastCheckpoint, broadcast, group_subscribers, load_digest_state, render_digest,
+    save_digest_state, seconds_until, split_message,
+)
 from openai import OpenAI
 
 # Configurar logging
@@ -31,9 +62,13 @@ else:
     ai_client = None
     logger.warning("OPENAI_API_KEY não configurada. Funções de IA estarão desabilitadas.")
 
-def get_ai_response(prompt: str) -> str:
+AI_ERROR_MESSAGE = "❌ Ocorreu um erro ao processar a solicitação com a Inteligência Artificial."
+
+
+def get_ai_response(prompt: str, history: list = None) -> str:
     """
     Chama a API de IA para gerar uma resposta detalhada.
+    `history` traz as mensagens anteriores da conversa (resumo e trocas recentes).
     """
     if not ai_client:
         return "Desculpe, a função de Inteligência Artificial está desabilitada (chave de API não configurada)."
@@ -44,6 +79,7 @@ def get_ai_response(prompt: str) -> str:
             model="gpt-4.1-mini", # Modelo disponível no ambiente
             messages=[
                 {"role": "system", "content": "Você é um assistente de análise esportiva. Responda de forma detalhada, profissional e use Markdown para formatar a resposta."},
+                *(history or []),
                 {"role": "user", "content": prompt}
             ]
         )
@@ -52,7 +88,7 @@ def get_ai_response(prompt: str) -> str:
     
     except Exception as e:
         logger.error(f"Erro ao chamar a API de IA: {e}")
-        return "❌ Ocorreu um erro ao processar a solicitação com a Inteligência Artificial."
+        return AI_ERROR_MESSAGE
 # --- FIM DA CONFIGURAÇÃO DA API DE IA ---
 
 
@@ -61,9 +97,40 @@ class FootballBotHandler:
     
     def __init__(self):
         self.scraper = FootballScraper()
-        self.user_preferences = {}  # Armazenar preferências de ligas por usuário
-        # Adicionando um estado para o comando /analisar
-        self.awaiting_analysis_query = {}
+        # Camadas de execução: threads para rede/disco, processos para CPU
+        self.executor = TieredExecutor(
+            io_workers=IO_WORKERS, cpu_workers=CPU_WORKERS,
+            io_queue_limit=IO_QUEUE_LIMIT, cpu_queue_limit=CPU_QUEUE_LIMIT,
+        )
+        # Reinício "aquecido": restaura o cache do último snapshot
+        state = load_snapshot(SNAPSHOT_FILE)
+        if state:
+            self.scraper.restore_state(state)
+        # Sessões do /analisar: histórico resumido por usuário, com expiração por inatividade
+        self.conversations = ConversationStore(
+            token_budget=ANALYSIS_TOKEN_BUDGET, summary_tokens=ANALYSIS_SUMMARY_TOKENS,
+            idle_timeout=ANALYSIS_IDLE_TIMEOUT, max_sessions=ANALYSIS_MAX_SESSIONS,
+        )
+        # Índice de busca do modo inline, reconstruído só quando a lista de jogos
+        # (times e ligas) muda; placares e status vêm dos dados atuais a cada busca
+        self.search_index = None
+        self.search_index_version = None
+        self.search_index_fixtures = None
+        self.search_latest_matches = {}
+        self.search_index_lock = asyncio.Lock()
+        # Páginas do /jogos renderizadas, por (filtro, ligas, página, versão dos dados)
+        self.jogos_page_cache = LRUCache(JOGOS_RENDER_CACHE_SIZE)
+        # Listas ordenadas do /jogos, por (ligas, versão dos dados)
+        self.jogos_list_cache = LRUCache(32)
+        # Inscritos no resumo e preferências de ligas, salvos juntos para que o
+        # resumo continue "das suas ligas" depois de um reinício
+        self.digest_subscribers, self.user_preferences = load_digest_state(DIGEST_SUBSCRIBERS_FILE)
+        self.digest_state_lock = asyncio.Lock()
+        # Atualização dos jogos conforme status e proximidade do início
+        self.refresh_scheduler = RefreshScheduler(
+            self.scraper.refresh_match,
+            requests_per_minute=REFRESH_REQUESTS_PER_MINUTE,
+        )
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Comando /start - Mensagem de boas-vindas"""
@@ -80,10 +147,12 @@ Estou aqui para ajudar você com previsões de jogos e análises para suas apost
 
 *Comandos disponíveis:*
 
-/jogos - Ver todos os jogos de hoje
+/jogos - Ver todos os jogos de hoje (/jogos minhas para só as suas ligas)
 /probabilidades - Ver probabilidades de vitória
+/multipla - Montar uma múltipla com os jogos de hoje
 /analisar - Pedir uma análise detalhada à Inteligência Artificial
 /ligas - Selecionar ligas de interesse
+/resumo - Receber (ou parar de receber) o resumo diário
 /ajuda - Obter ajuda
 /sobre - Informações sobre o bot
 
@@ -93,14 +162,62 @@ Escolha um comando acima para começar! 🚀
         await update.message.reply_text(welcome_message, parse_mode='Markdown')
         logger.info(f"Usuário {user_id} iniciou o bot")
     
+    async def _ensure_matches(self) -> None:
+        """Renova a lista de jogos em cache na camada de IO, se expirada"""
+        if self.scraper.cache_expired():
+            await self.executor.run_io(self.scraper.get_today_matches)
+    
+    def _jogos_leagues(self, filter_code: str, user_id: int) -> tuple:
+        """Ligas do filtro do /jogos (vazio = todas)"""
+        if filter_code == FILTER_PREFERENCES:
+            return tuple(sorted(self.user_preferences.get(user_id) or ()))
+        return ()
+    
+    def _render_jogos_page(self, filter_code: str, leagues: tuple, page: int):
+        """
+        Renderiza uma página do /jogos, usando o cache sempre que possível
+        (chame _ensure_matches antes para não buscar dados no event loop)
+        
+        Returns:
+            (texto, teclado de navegação ou None, total de jogos do filtro)
+        """
+        version = self.scraper.data_version
+        
+        # O filtro entra na chave: o teclado de navegação codifica o filtro, e
+        # "todas" e "minhas" (sem preferências) têm as mesmas ligas
+        cache_key = (filter_code, leagues, page, version)
+        cached = self.jogos_page_cache.get(cache_key)
+        if cached:
+            return cached
+        
+        matches = self.jogos_list_cache.get((leagues, version))
+        if matches is None:
+            matches = sort_matches(self.scraper.get_today_matches(), leagues)
+            self.jogos_list_cache.put((leagues, version), matches)
+        
+        text, page_rendered, total_pages = render_page(matches, page, JOGOS_PAGE_SIZE)
+        buttons = navigation_buttons(filter_code, page_rendered, total_pages)
+        markup = InlineKeyboardMarkup([[
+            InlineKeyboardButton(label, callback_data=data) for label, data in buttons
+        ]]) if buttons else None
+        
+        rendered = (text, markup, len(matches))
+        self.jogos_page_cache.put(cache_key, rendered)
+        return rendered
+    
     async def jogos(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Comando /jogos - Listar todos os jogos de hoje"""
+        """Comando /jogos [minhas] - Listar os jogos de hoje em páginas"""
         try:
-            await update.message.reply_text("🔄 Buscando jogos de hoje... Por favor, aguarde.", parse_mode='Markdown')
+            user_id = update.effective_user.id
+            filter_code = FILTER_ALL
+            if context.args and context.args[0].lower() in ('minhas', 'ligas'):
+                filter_code = FILTER_PREFERENCES
+            leagues = self._jogos_leagues(filter_code, user_id)
             
-            matches = self.scraper.get_today_matches()
+            await self._ensure_matches()
+            text, markup, total = self._render_jogos_page(filter_code, leagues, 0)
             
-            if not matches:
+            if not total:
                 await update.message.reply_text(
                     "❌ Desculpe, não consegui encontrar jogos de hoje no momento.\n"
                     "Tente novamente mais tarde.",
@@ -108,27 +225,8 @@ Escolha um comando acima para começar! 🚀
                 )
                 return
             
-            # Agrupar jogos por liga
-            matches_by_league = {}
-            for match in matches:
-                league = match.get('league', 'Sem Liga')
-                if league not in matches_by_league:
-                    matches_by_league[league] = []
-                matches_by_league[league].append(match)
-            
-            # Enviar mensagens por liga
-            for league, league_matches in list(matches_by_league.items())[:5]:  # Limitar a 5 ligas
-                message = f"🏆 *{league}*\n\n"
-                for match in league_matches[:3]:  # Limitar a 3 jogos por liga
-                    message += f"⚽ {match.get('home_team', 'Time A')} vs {match.get('away_team', 'Time B')}\n"
-                    if match.get('time'):
-                        message += f"🕐 {match['time']}\n"
-                    message += "\n"
-                
-                await update.message.reply_text(message, parse_mode='Markdown')
-                await asyncio.sleep(0.5)  # Pequeno delay entre mensagens
-            
-            logger.info(f"Usuário {update.effective_user.id} consultou jogos de hoje")
+            await update.message.reply_text(text, reply_markup=markup, parse_mode='Markdown')
+            logger.info(f"Usuário {user_id} consultou jogos de hoje")
         
         except Exception as e:
             logger.error(f"Erro ao listar jogos: {str(e)}")
@@ -137,12 +235,32 @@ Escolha um comando acima para começar! 🚀
                 parse_mode='Markdown'
             )
     
+    async def jogos_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handler dos botões ◀/▶ do /jogos - edita a mesma mensagem"""
+        query = update.callback_query
+        await query.answer()
+        
+        decoded = decode_callback(query.data)
+        if not decoded:
+            return
+        filter_code, page = decoded
+        
+        leagues = self._jogos_leagues(filter_code, query.from_user.id)
+        await self._ensure_matches()
+        text, markup, _ = self._render_jogos_page(filter_code, leagues, page)
+        try:
+            await query.edit_message_text(text, reply_markup=markup, parse_mode='Markdown')
+        except BadRequest as e:
+            # Clique no indicador de página: o conteúdo não mudou
+            if 'not modified' not in str(e).lower():
+                raise
+    
     async def probabilidades(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Comando /probabilidades - Mostrar probabilidades de vitória"""
         try:
             await update.message.reply_text("🔄 Calculando probabilidades... Por favor, aguarde.", parse_mode='Markdown')
             
-            predictions = self.scraper.get_match_predictions()
+            predictions = await self.executor.run_io(self.scraper.get_match_predictions)
             
             if not predictions:
                 await update.message.reply_text(
@@ -166,6 +284,64 @@ Escolha um comando acima para começar! 🚀
                 parse_mode='Markdown'
             )
     
+    async def multipla(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Comando /multipla [pernas] [odd mínima] [prob|ev] - Montar uma múltipla"""
+        args = context.args or []
+        try:
+            legs = int(args[0]) if len(args) > 0 else ACCUMULATOR_DEFAULT_LEGS
+            min_odds = float(args[1].replace(',', '.')) if len(args) > 1 else ACCUMULATOR_DEFAULT_MIN_ODDS
+            objective = args[2].lower() if len(args) > 2 else 'prob'
+            if not 1 <= legs <= ACCUMULATOR_MAX_LEGS or objective not in OBJECTIVES:
+                raise ValueError(objective)
+        except ValueError:
+            await update.message.reply_text(
+                f"❌ Uso: /multipla `[pernas 1-{ACCUMULATOR_MAX_LEGS}] [odd mínima] [prob|ev]`\n"
+                "Ex: /multipla 4 5.0 ev",
+                parse_mode='Markdown'
+            )
+            return
+        
+        try:
+            user_id = update.effective_user.id
+            leagues = self.user_preferences.get(user_id)
+            predictions = await self.executor.run_io(self.scraper.get_match_predictions)
+            selections = build_selections(predictions, leagues)
+            # A busca combinatória roda no pool de processos para não travar o bot
+            result = await self.executor.run_cpu(
+                build_accumulator, selections, legs, min_odds=min_odds, objective=objective,
+                beam_width=ACCUMULATOR_BEAM_WIDTH,
+            )
+            
+            if not result:
+                await update.message.reply_text(
+                    "❌ Não encontrei uma múltipla com essas restrições. "
+                    "Tente menos pernas ou uma odd mínima menor.",
+                    parse_mode='Markdown'
+                )
+                return
+            
+            goal = "valor esperado" if objective == 'ev' else "probabilidade de acerto"
+            message = f"🎯 *Múltipla de {legs} pernas* (maior {goal})\n\n"
+            for selection in result['selections']:
+                match = selection.match
+                message += f"⚽ {match.get('home_team', 'Time A')} vs {match.get('away_team', 'Time B')}\n"
+                message += f"   ➡️ {selection.label()} @ {selection.odd:.2f} ({selection.probability * 100:.1f}%)\n"
+            message += f"\n💰 *Odd total:* {result['odds']}\n"
+            message += f"📈 *Probabilidade:* {result['probability']}%\n"
+            message += f"📊 *Valor esperado:* {result['expected_value']:+.2f}%\n"
+            if leagues:
+                message += f"\n🏆 Ligas: {', '.join(leagues)}"
+            
+            await update.message.reply_text(message, parse_mode='Markdown')
+            logger.info(f"Usuário {user_id} montou uma múltipla de {legs} pernas")
+        
+        except Exception as e:
+            logger.error(f"Erro ao montar múltipla: {str(e)}")
+            await update.message.reply_text(
+                "❌ Ocorreu um erro ao montar a múltipla. Tente novamente.",
+                parse_mode='Markdown'
+            )
+    
     async def analisar_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Comando /analisar - Inicia o modo de análise por IA."""
         if not ai_client:
@@ -176,12 +352,13 @@ Escolha um comando acima para começar! 🚀
             return
 
         user_id = update.effective_user.id
-        self.awaiting_analysis_query[user_id] = True
+        self.conversations.start(user_id)
         
         await update.message.reply_text(
             "🧠 *Modo de Análise IA Ativado.*\n\n"
             "Envie sua pergunta ou solicitação de análise detalhada sobre qualquer jogo ou estatística. "
             "Ex: 'Qual a chance do time X vencer o time Y hoje?'\n\n"
+            "Você pode continuar com perguntas de acompanhamento; a conversa é lembrada até você sair.\n"
             "Para sair, use o comando /cancelar.",
             parse_mode='Markdown'
         )
@@ -190,18 +367,22 @@ Escolha um comando acima para começar! 🚀
         """Processa a mensagem do usuário no modo de análise IA."""
         user_id = update.effective_user.id
         
-        if self.awaiting_analysis_query.get(user_id):
+        if user_id in self.conversations:
             query = update.message.text
             
-            # Remove o estado de espera para evitar processamento duplicado
-            self.awaiting_analysis_query[user_id] = False
+            # Histórico dentro do orçamento de tokens (trocas antigas viram resumo)
+            history, prompt = self.conversations.build_messages(user_id, query)
             
             # Mensagem de processamento
-            await update.message.reply_text("⏳ *Processando sua solicitação de análise IA...* Isso pode levar alguns segundos.", parse_mode='Markdown')
+            notice = "⏳ *Processando sua solicitação de análise IA...* Isso pode levar alguns segundos."
+            if prompt != query:
+                notice += "\n⚠️ Sua pergunta era longa demais e foi encurtada."
+            await update.message.reply_text(notice, parse_mode='Markdown')
             
             # Chama a função de IA de forma assíncrona
-            loop = asyncio.get_event_loop()
-            response_text = await loop.run_in_executor(None, get_ai_response, query)
+            response_text = await self.executor.run_io(get_ai_response, prompt, history)
+            if response_text != AI_ERROR_MESSAGE:
+                self.conversations.add_turn(user_id, prompt, response_text)
             
             await update.message.reply_text(response_text, parse_mode='Markdown')
             
@@ -213,7 +394,7 @@ Escolha um comando acima para começar! 🚀
     async def cancelar(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Comando /cancelar - Sai do modo de análise IA."""
         user_id = update.effective_user.id
-        if self.awaiting_analysis_query.pop(user_id, False):
+        if self.conversations.end(user_id):
             await update.message.reply_text("✅ Modo de Análise IA cancelado. Você pode usar outros comandos.", parse_mode='Markdown')
         else:
             await update.message.reply_text("Você não estava no modo de Análise IA.", parse_mode='Markdown')
@@ -237,6 +418,137 @@ Escolha um comando acima para começar! 🚀
             parse_mode='Markdown'
         )
     
+    async def resumo(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Comando /resumo - Ativar ou desativar o resumo diário"""
+        user_id = update.effective_user.id
+        
+        if user_id in self.digest_subscribers:
+            self.digest_subscribers.discard(user_id)
+            message = "🔕 Você não receberá mais o resumo diário."
+        else:
+            self.digest_subscribers.add(user_id)
+            message = (
+                "🔔 *Resumo diário ativado!*\n\n"
+                f"Todo dia às {DIGEST_TIME} você receberá os jogos e probabilidades "
+                "das suas ligas (use /ligas para escolhê-las). Envie /resumo novamente para cancelar."
+            )
+        
+        await self.save_digest_state()
+        await update.message.reply_text(message, parse_mode='Markdown')
+    
+    async def save_digest_state(self) -> None:
+        """Grava inscritos e preferências fora do event loop, uma escrita por vez"""
+        async with self.digest_state_lock:
+            # A cópia é feita no loop; só a serialização e a escrita vão para a thread
+            subscribers = list(self.digest_subscribers)
+            preferences = {user_id: list(leagues) for user_id, leagues in self.user_preferences.items()}
+            try:
+                await self.executor.run_io(save_digest_state, DIGEST_SUBSCRIBERS_FILE, subscribers, preferences)
+            except Exception as e:
+                logger.error(f"Erro ao salvar inscritos do resumo: {str(e)}")
+    
+    async def send_daily_digest(self, bot) -> None:
+        """Envia o resumo do dia para todos os inscritos, retomando envios interrompidos"""
+        checkpoint = BroadcastCheckpoint(DIGEST_CHECKPOINT_FILE, key=datetime.now().strftime("%Y-%m-%d"))
+        if checkpoint.completed:
+            logger.info("Resumo diário de hoje já foi enviado")
+            return
+        
+        predictions = await self.executor.run_io(self.scraper.get_match_predictions)
+        groups = group_subscribers(self.digest_subscribers, self.user_preferences)
+        
+        # Cada conjunto distinto de ligas é renderizado uma única vez
+        rendered = {
+            leagues: split_message(render_digest(predictions, leagues))
+            for leagues in groups
+        }
+        deliveries = (
+            (user_id, rendered[leagues])
+            for leagues, user_ids in groups.items()
+            for user_id in user_ids
+        )
+        
+        logger.info(
+            f"Enviando resumo diário para {len(self.digest_subscribers)} usuários "
+            f"({len(groups)} resumos distintos)"
+        )
+        stats = await broadcast(
+            deliveries,
+            send=lambda chat_id, text: bot.send_message(chat_id=chat_id, text=text, parse_mode='Markdown'),
+            checkpoint=checkpoint,
+            rate_per_second=DIGEST_RATE_PER_SECOND,
+            workers=DIGEST_WORKERS,
+        )
+        
+        # Usuários que bloquearam o bot deixam de ser inscritos
+        if stats['blocked']:
+            self.digest_subscribers.difference_update(stats['blocked'])
+            await self.save_digest_state()
+        
+        logger.info(
+            f"Resumo diário enviado: {stats['sent']} enviados, {stats['skipped']} já enviados, "
+            f"{len(stats['blocked'])} bloqueados, {stats['failed']} falhas"
+        )
+    
+    async def digest_scheduler(self, application: Application) -> None:
+        """Agenda o envio diário do resumo no horário configurado"""
+        # Retoma um envio de hoje interrompido por uma reinicialização
+        checkpoint = BroadcastCheckpoint(DIGEST_CHECKPOINT_FILE, key=datetime.now().strftime("%Y-%m-%d"))
+        if checkpoint.started and not checkpoint.completed:
+            logger.info("Retomando o resumo diário interrompido")
+            try:
+                await self.send_daily_digest(application.bot)
+            except Exception as e:
+                logger.error(f"Erro ao retomar o resumo diário: {str(e)}")
+        
+        while True:
+            await asyncio.sleep(seconds_until(DIGEST_TIME))
+            try:
+                await self.send_daily_digest(application.bot)
+            except Exception as e:
+                logger.error(f"Erro ao enviar o resumo diário: {str(e)}")
+    
+    def save_snapshot(self, state: dict = None) -> None:
+        """Grava um snapshot do estado do scraper"""
+        try:
+            size = save_snapshot(SNAPSHOT_FILE, state or self.scraper.export_state())
+            logger.info(f"Snapshot do estado gravado ({size} bytes)")
+        except Exception as e:
+            logger.error(f"Erro ao gravar snapshot: {str(e)}")
+    
+    async def snapshot_loop(self) -> None:
+        """Grava snapshots periódicos do estado do scraper"""
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            # O estado é copiado no loop; só a serialização e a escrita vão para a thread
+            state = self.scraper.export_state()
+            await self.executor.run_io(self.save_snapshot, state)
+    
+    async def executor_metrics_loop(self) -> None:
+        """Registra periodicamente as métricas das camadas de execução e a saúde dos provedores"""
+        while True:
+            await asyncio.sleep(EXECUTOR_METRICS_INTERVAL)
+            logger.info(f"Camadas de execução: {self.executor.metrics()}")
+            for health in self.scraper.get_provider_health():
+                logger.info(f"Provedor {health['name']}: {health}")
+    
+    async def post_init(self, application: Application) -> None:
+        """Inicia as tarefas em segundo plano do bot"""
+        application.create_task(self.digest_scheduler(application))
+        application.create_task(self.snapshot_loop())
+        application.create_task(self.executor_metrics_loop())
+        application.create_task(self.refresh_scheduler.run(
+            source=self.scraper.get_today_matches,
+            on_update=self.scraper.update_match,
+            sync_interval=REFRESH_SYNC_INTERVAL,
+            run_blocking=self.executor.run_io,
+        ))
+    
+    async def post_shutdown(self, application: Application) -> None:
+        """Grava um último snapshot e encerra as camadas de execução"""
+        self.save_snapshot()
+        self.executor.shutdown()
+    
     async def ajuda(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Comando /ajuda - Mostrar ajuda"""
         help_text = """
@@ -246,11 +558,13 @@ Este bot fornece estatísticas e probabilidades de jogos de futebol para auxilia
 
 *Como usar:*
 
-1. **/jogos** - Veja todos os jogos de hoje
+1. **/jogos** - Veja todos os jogos de hoje, em páginas (use **/jogos minhas** para só as suas ligas)
 2. **/probabilidades** - Veja as probabilidades de vitória
-3. **/analisar** - Peça uma análise detalhada à Inteligência Artificial
-4. **/ligas** - Selecione suas ligas favoritas
-5. **/sobre** - Informações sobre o bot
+3. **/multipla** `[pernas] [odd mínima] [prob|ev]` - Monte uma múltipla (ex: /multipla 4 5.0 ev)
+4. **/analisar** - Peça uma análise detalhada à Inteligência Artificial
+5. **/ligas** - Selecione suas ligas favoritas
+6. **/resumo** - Receba toda manhã os jogos e probabilidades das suas ligas
+7. **/sobre** - Informações sobre o bot
 
 *Informações importantes:*
 
@@ -313,6 +627,7 @@ Use por sua conta e risco!
             
             if selected_league not in self.user_preferences[user_id]:
                 self.user_preferences[user_id].append(selected_league)
+                await self.save_digest_state()
                 await query.edit_message_text(
                     f"✅ {selected_league} adicionada às suas preferências!"
                 )
@@ -321,6 +636,61 @@ Use por sua conta e risco!
                     f"ℹ️ {selected_league} já está nas suas preferências!"
                 )
     
+    async def _get_search_index(self) -> TeamSearchIndex:
+        """Retorna o índice de busca, reconstruindo-o quando a lista de jogos muda"""
+        # Renova o cache de jogos (se expirado) antes de comparar a versão
+        await self._ensure_matches()
+        async with self.search_index_lock:
+            version = self.scraper.data_version
+            if self.search_index is not None and self.search_index_version == version:
+                return self.search_index
+            
+            matches = self.scraper.get_today_matches()
+            fixtures = frozenset(match_key(match) for match in matches)
+            if self.search_index is None or fixtures != self.search_index_fixtures:
+                # A construção do índice fica fora do event loop
+                predictions = await self.executor.run_io(self.scraper.get_match_predictions)
+                self.search_index = await self.executor.run_io(
+                    TeamSearchIndex, predictions, aliases=TEAM_ALIASES,
+                )
+                self.search_index_fixtures = fixtures
+            # Mudanças de placar/status só atualizam os dados exibidos
+            self.search_latest_matches = {match_key(match): match for match in matches}
+            self.search_index_version = version
+            return self.search_index
+    
+    async def inline_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Modo inline (@bot flamengo) - Buscar jogos por time, apelido ou liga"""
+        inline_query = update.inline_query
+        
+        try:
+            index = await self._get_search_index()
+            matches = [
+                {**match, **self.search_latest_matches.get(match_key(match), {})}
+                for match in index.search(inline_query.query, limit=INLINE_MAX_RESULTS)
+            ]
+            
+            results = []
+            for idx, match in enumerate(matches):
+                description = match.get('league', '')
+                if match.get('time'):
+                    description += f" • {match['time']}"
+                
+                results.append(InlineQueryResultArticle(
+                    id=str(idx),
+                    title=f"{match.get('home_team', 'Time A')} vs {match.get('away_team', 'Time B')}",
+                    description=description,
+                    input_message_content=InputTextMessageContent(
+                        self.scraper.format_match_for_telegram(match),
+                        parse_mode='Markdown'
+                    ),
+                ))
+            
+            await inline_query.answer(results, cache_time=INLINE_CACHE_TIME)
+        
+        except Exception as e:
+            logger.error(f"Erro na busca inline: {str(e)}")
+    
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handler de erros"""
         logger.error(f"Erro no bot: {context.error}")
@@ -331,31 +701,44 @@ Use por sua conta e risco!
             )
 
 
-async def main():
+def main():
     """Função principal para iniciar o bot"""
     logger.info("Iniciando Bot de Futebol...")
     
-    # Criar aplicação
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-    
     # Instanciar handler
     handler = FootballBotHandler()
     
+    # Criar aplicação
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .base_url(TELEGRAM_API_BASE_URL)
+        .post_init(handler.post_init)
+        .post_shutdown(handler.post_shutdown)
+        .build()
+    )
+    
     # Registrar handlers de comandos
     application.add_handler(CommandHandler("start", handler.start))
     application.add_handler(CommandHandler("jogos", handler.jogos))
     application.add_handler(CommandHandler("probabilidades", handler.probabilidades))
+    application.add_handler(CommandHandler("multipla", handler.multipla))
     application.add_handler(CommandHandler("analisar", handler.analisar_start)) # NOVO
     application.add_handler(CommandHandler("cancelar", handler.cancelar)) # NOVO
     application.add_handler(CommandHandler("ligas", handler.ligas))
+    application.add_handler(CommandHandler("resumo", handler.resumo))
     application.add_handler(CommandHandler("ajuda", handler.ajuda))
     application.add_handler(CommandHandler("sobre", handler.sobre))
     
     # Handler para processar a mensagem no modo de análise IA
     application.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handler.analisar_process))
     
-    # Registrar handler de callbacks
-    application.add_handler(CallbackQueryHandler(handler.handle_league_selection))
+    # Handler do modo inline (@bot flamengo)
+    application.add_handler(InlineQueryHandler(handler.inline_query))
+    
+    # Registrar handlers de callbacks
+    application.add_handler(CallbackQueryHandler(handler.jogos_page, pattern=r'^jg\|'))
+    application.add_handler(CallbackQueryHandler(handler.handle_league_selection, pattern=r'^liga_'))
     
     # Registrar handler de erros
     application.add_error_handler(handler.error_handler)
@@ -363,13 +746,13 @@ async def main():
     logger.info("Bot iniciado com sucesso!")
     logger.info("Aguardando mensagens...")
     
-    # Iniciar o bot
-    await application.run_polling()
+    # Iniciar o bot (run_polling gerencia o próprio event loop)
+    application.run_polling()
 
 
 if __name__ == '__main__':
     try:
-        asyncio.run(main())
+        main()
     except KeyboardInterrupt:
         logger.info("Bot interrompido pelo usuário")
     except Exception as e:
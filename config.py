@@ -1,9 +1,14 @@
 # Configuração do Bot Telegram de Futebol
 # ========================================
 
+import os
+
 # Token do Bot Telegram
 TELEGRAM_BOT_TOKEN = "8284008980:AAFGBhdZlWAzSsv6r9OJnai5K2k_4rQW61g"
 
+# URL base da Bot API (troque pela do fake_telegram.py para testes de carga)
+TELEGRAM_API_BASE_URL = os.environ.get("TELEGRAM_API_BASE_URL", "https://api.telegram.org/bot")
+
 # Configurações de Scraping
 FLASHSCORE_BASE_URL = "https://www.flashscore.com"
 FLASHSCORE_FOOTBALL_URL = "https://www.flashscore.com/football/"
@@ -12,6 +17,21 @@ FLASHSCORE_FOOTBALL_URL = "https://www.flashscore.com/football/"
 REQUEST_TIMEOUT = 10
 MAX_RETRIES = 3
 
+# Provedores de Dados (opcional)
+# Deixe a lista vazia para usar os dados simulados. Exemplo:
+# DATA_PROVIDERS = [
+#     {'name': 'football-data', 'base_url': 'https://api.football-data.org/v4',
+#      'daily_quota': 100, 'headers': {'X-Auth-Token': 'seu_token'}},
+#     {'name': 'api-sports', 'base_url': 'https://v3.football.api-sports.io',
+#      'daily_quota': 100, 'headers': {'x-apisports-key': 'sua_chave'}},
+# ]
+DATA_PROVIDERS = []
+
+# Circuit Breaker e Hedge entre provedores
+CIRCUIT_FAILURE_THRESHOLD = 3   # Falhas consecutivas para abrir o circuito
+CIRCUIT_RESET_TIMEOUT = 30      # Segundos até liberar uma requisição de teste
+HEDGE_AFTER_SECONDS = 2.0       # Atraso do hedge enquanto não há p95 medido
+
 # Headers para requisições HTTP
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
@@ -29,6 +49,68 @@ LEAGUES_OF_INTEREST = [
     "Europa League",
 ]
 
+# Cache e Atualização Adaptativa dos Jogos
+MATCHES_CACHE_TTL = 600             # Segundos até buscar novamente a lista de jogos do dia
+REFRESH_REQUESTS_PER_MINUTE = 30    # Orçamento global de atualizações por minuto
+REFRESH_SYNC_INTERVAL = 60          # Segundos entre sincronizações com a lista de jogos
+STANDINGS_CACHE_TTL = 3600          # Segundos até buscar novamente a classificação de uma liga
+
+# Snapshots do Estado (reinício "aquecido")
+SNAPSHOT_FILE = "scraper_state.snap"
+SNAPSHOT_INTERVAL = 300             # Segundos entre snapshots
+
+# Apelidos usados na busca inline (@bot flamengo)
+TEAM_ALIASES = {
+    "Manchester United": ["Man Utd", "Man United", "Red Devils"],
+    "Liverpool": ["Reds"],
+    "Real Madrid": ["Merengues"],
+    "Barcelona": ["Barça", "Barca", "Blaugrana"],
+    "Bayern Munich": ["Bayern München", "FC Bayern"],
+    "Borussia Dortmund": ["BVB"],
+    "Paris Saint-Germain": ["PSG"],
+    "Marseille": ["OM"],
+    "AC Milan": ["Rossoneri"],
+    "Inter Milan": ["Internazionale", "Nerazzurri"],
+    "Flamengo": ["Mengão", "Fla"],
+    "Palmeiras": ["Verdão", "Porco"],
+    "Campeonato Brasileiro": ["Brasileirão"],
+    "Premier League": ["EPL"],
+}
+
+# Modo Inline
+INLINE_MAX_RESULTS = 20     # Máximo de resultados por consulta
+INLINE_CACHE_TIME = 60      # Segundos que o Telegram mantém a resposta em cache
+
+# Resumo Diário
+DIGEST_TIME = "08:00"                           # Horário de envio (HH:MM, hora local)
+DIGEST_RATE_PER_SECOND = 25                     # Abaixo do limite de ~30 msg/s do Telegram
+DIGEST_WORKERS = 16                             # Envios simultâneos
+DIGEST_SUBSCRIBERS_FILE = "digest_subscribers.json"     # Inscritos e preferências de ligas
+DIGEST_CHECKPOINT_FILE = "digest_checkpoint.log"
+
+# Paginação do /jogos
+JOGOS_PAGE_SIZE = 10            # Jogos por página
+JOGOS_RENDER_CACHE_SIZE = 256   # Páginas renderizadas mantidas em cache
+
+# Múltiplas (/multipla)
+ACCUMULATOR_DEFAULT_LEGS = 3
+ACCUMULATOR_MAX_LEGS = 10
+ACCUMULATOR_DEFAULT_MIN_ODDS = 3.0
+ACCUMULATOR_BEAM_WIDTH = 64
+
+# Camadas de Execução dos Handlers
+IO_WORKERS = 16                 # Threads para chamadas de rede e disco
+IO_QUEUE_LIMIT = 256            # Tarefas de IO aguardando além das threads ocupadas
+CPU_WORKERS = 2                 # Processos para tarefas pesadas de CPU
+CPU_QUEUE_LIMIT = 32            # Tarefas de CPU aguardando além dos processos ocupados
+EXECUTOR_METRICS_INTERVAL = 60  # Segundos entre registros das métricas de fila
+
+# Conversas do /analisar
+ANALYSIS_TOKEN_BUDGET = 3000    # Tokens de histórico + pergunta por pedido à IA
+ANALYSIS_SUMMARY_TOKENS = 400   # Tamanho máximo do resumo das trocas antigas
+ANALYSIS_IDLE_TIMEOUT = 1800    # Segundos sem mensagens até a sessão expirar
+ANALYSIS_MAX_SESSIONS = 1000    # Sessões simultâneas mantidas em memória
+
 # Configurações de Logging
 LOG_LEVEL = "INFO"
 LOG_FILE = "football_bot.log"
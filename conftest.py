@@ -0,0 +1,20 @@
+"""
+Fixtures compartilhadas pelos testes
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Relógio controlável para avançar o tempo nos testes"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
@@ -0,0 +1,178 @@
+"""
+Módulo de Conversas do /analisar
+Guarda o histórico de cada usuário de forma compacta: as últimas trocas
+ficam completas e as mais antigas são resumidas para que cada pedido à IA
+caiba em um orçamento de tokens. Sessões ociosas são descartadas.
+"""
+
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Estimativa grosseira de tokens (~4 caracteres por token em português)
+CHARS_PER_TOKEN = 4
+
+Turn = Tuple[str, str]  # (pergunta, resposta)
+
+SUMMARY_HEADER = "Resumo da conversa até aqui:\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estima o número de tokens de um texto"""
+    return -(-len(text or '') // CHARS_PER_TOKEN)
+
+
+def _first_sentence(text: str, max_chars: int) -> str:
+    text = ' '.join((text or '').split())
+    for mark in ('. ', '! ', '? ', '\n'):
+        index = text.find(mark)
+        if 0 < index < max_chars:
+            return text[:index + 1]
+    return text if len(text) <= max_chars else text[:max_chars - 1] + '…'
+
+
+def extractive_summary(previous: str, turns: Iterable[Turn], max_tokens: int) -> str:
+    """
+    Resumo sem chamada à IA: mantém a pergunta e a primeira frase de cada
+    resposta, descartando as linhas mais antigas quando passa do limite
+
+    Args:
+        previous: Resumo acumulado até agora
+        turns: Trocas a incorporar ao resumo
+        max_tokens: Tamanho máximo do resumo
+
+    Returns:
+        Novo resumo
+    """
+    lines = previous.splitlines() if previous else []
+    for question, answer in turns:
+        lines.append(f"- P: {_first_sentence(question, 160)} R: {_first_sentence(answer, 240)}")
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    while lines and len('\n'.join(lines)) > max_chars:
+        lines.pop(0)
+    return '\n'.join(lines)
+
+
+class Session:
+    """Conversa de um usuário: resumo das trocas antigas e as trocas recentes"""
+
+    __slots__ = ('summary', 'turns', 'last_active')
+
+    def __init__(self, now: float):
+        self.summary = ''
+        self.turns: deque = deque()
+        self.last_active = now
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(
+            estimate_tokens(question) + estimate_tokens(answer) for question, answer in self.turns
+        )
+
+
+class ConversationStore:
+    """
+    Sessões do /analisar por usuário
+
+    As sessões ficam em ordem de uso, então as ociosas são sempre as
+    primeiras e a limpeza não precisa percorrer todas.
+    """
+
+    def __init__(self, token_budget: int = 3000, summary_tokens: int = 400,
+                 idle_timeout: float = 1800, max_sessions: int = 1000,
+                 summarizer: Optional[Callable[[str, List[Turn], int], str]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.summarizer = summarizer or extractive_summary
+        self._clock = clock
+        self._sessions: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, user_id) -> bool:
+        return self.get(user_id) is not None
+
+    def evict_idle(self) -> int:
+        """Descarta as sessões ociosas; retorna quantas foram removidas"""
+        now = self._clock()
+        removed = 0
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if now - session.last_active < self.idle_timeout:
+                break
+            del self._sessions[user_id]
+            removed += 1
+        return removed
+
+    def start(self, user_id) -> Session:
+        """Inicia (ou reinicia) a sessão do usuário"""
+        self.evict_idle()
+        session = self._sessions[user_id] = Session(self._clock())
+        self._sessions.move_to_end(user_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def get(self, user_id) -> Optional[Session]:
+        """Sessão ativa do usuário ou None (inexistente ou expirada)"""
+        self.evict_idle()
+        return self._sessions.get(user_id)
+
+    def end(self, user_id) -> bool:
+        """Encerra a sessão; retorna se havia uma ativa"""
+        self.evict_idle()
+        return self._sessions.pop(user_id, None) is not None
+
+    def _compact(self, session: Session, reserve: int) -> None:
+        """Resume as trocas mais antigas até a sessão caber no orçamento"""
+        # O resumo novo pode crescer, então repete até caber (ou não sobrar trocas)
+        while session.turns and session.tokens() + reserve > self.token_budget:
+            rolled = []
+            while session.turns and session.tokens() + reserve > self.token_budget:
+                rolled.append(session.turns.popleft())
+            session.summary = self.summarizer(session.summary, rolled, self.summary_tokens)
+
+    def fit_question(self, summary: str, question: str) -> str:
+        """Encurta a pergunta para caber no orçamento junto com o resumo"""
+        available = max(1, self.token_budget - estimate_tokens(summary))
+        if estimate_tokens(question) <= available:
+            return question
+        return question[:available * CHARS_PER_TOKEN - 1] + '…'
+
+    def build_messages(self, user_id, question: str) -> Tuple[List[Dict], str]:
+        """
+        Monta o histórico a enviar junto com a nova pergunta
+
+        Returns:
+            (mensagens no formato da API de chat, sem o prompt de sistema e
+            sem a pergunta atual; a pergunta, encurtada se sozinha já passar
+            do orçamento). Sem sessão, o histórico é vazio.
+        """
+        session = self.get(user_id)
+        if session is None:
+            return [], self.fit_question('', question)
+        self._compact(session, estimate_tokens(question))
+
+        messages = []
+        if session.summary:
+            messages.append({'role': 'system', 'content': f"{SUMMARY_HEADER}{session.summary}"})
+        for previous_question, answer in session.turns:
+            messages.append({'role': 'user', 'content': previous_question})
+            messages.append({'role': 'assistant', 'content': answer})
+        # Se a pergunta não coube nem com todas as trocas resumidas, ela é encurtada
+        summary = messages[0]['content'] if session.summary else ''
+        return messages, self.fit_question(summary, question)
+
+    def add_turn(self, user_id, question: str, answer: str) -> None:
+        """Registra uma troca e renova a sessão"""
+        session = self.get(user_id)
+        if session is None:
+            return
+        session.turns.append((question, answer))
+        session.last_active = self._clock()
+        self._sessions.move_to_end(user_id)
+        self._compact(session, 0)
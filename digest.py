@@ -0,0 +1,350 @@
+"""
+Módulo do Resumo Diário
+Agrupa os inscritos por preferências de ligas, renderiza cada resumo uma
+única vez e envia tudo por um pipeline de broadcast com limite de taxa,
+retomável a partir de um checkpoint em disco
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from telegram.error import Forbidden, RetryAfter
+
+logger = logging.getLogger(__name__)
+
+# Limite de caracteres de uma mensagem do Telegram
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+
+def load_digest_state(path: str) -> Tuple[Set[int], Dict[int, List[str]]]:
+    """
+    Carrega os inscritos no resumo diário e as ligas preferidas dos usuários
+
+    Aceita também o formato antigo (apenas a lista de inscritos).
+
+    Returns:
+        (inscritos, preferências de ligas por usuário)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return set(), {}
+    except (OSError, ValueError) as e:
+        logger.error(f"Erro ao carregar inscritos do resumo: {str(e)}")
+        return set(), {}
+
+    if isinstance(data, list):
+        return set(data), {}
+    preferences = {int(user_id): list(leagues) for user_id, leagues in (data.get('preferences') or {}).items()}
+    return set(data.get('subscribers') or ()), preferences
+
+
+def save_digest_state(path: str, subscribers: Iterable[int], preferences: Dict[int, List[str]]) -> None:
+    """Salva os inscritos e as preferências de ligas (escrita atômica)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'subscribers': sorted(subscribers),
+            'preferences': {str(user_id): leagues for user_id, leagues in preferences.items()},
+        }, f)
+    os.replace(tmp_path, path)
+
+
+def seconds_until(time_of_day: str, now: Optional[datetime] = None) -> float:
+    """
+    Calcula quantos segundos faltam para o próximo horário HH:MM
+
+    Args:
+        time_of_day: Horário no formato HH:MM
+        now: Momento atual (padrão: agora)
+
+    Returns:
+        Segundos até a próxima ocorrência do horário
+    """
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in time_of_day.split(':'))
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def group_subscribers(subscribers: Iterable[int],
+                      preferences: Dict[int, List[str]]) -> Dict[FrozenSet[str], List[int]]:
+    """
+    Agrupa os inscritos por conjunto idêntico de ligas preferidas
+
+    Args:
+        subscribers: IDs dos usuários inscritos
+        preferences: Ligas preferidas por usuário (sem preferência = todas)
+
+    Returns:
+        Mapa conjunto de ligas -> usuários
+    """
+    groups: Dict[FrozenSet[str], List[int]] = {}
+    for user_id in subscribers:
+        leagues = frozenset(preferences.get(user_id) or ())
+        groups.setdefault(leagues, []).append(user_id)
+    return groups
+
+
+def render_digest(predictions: List[Dict], leagues: FrozenSet[str]) -> str:
+    """
+    Renderiza o resumo do dia para um conjunto de ligas
+
+    Args:
+        predictions: Jogos com probabilidades (get_match_predictions)
+        leagues: Ligas a incluir (vazio = todas)
+
+    Returns:
+        Texto do resumo em Markdown
+    """
+    matches_by_league: Dict[str, List[Dict]] = {}
+    for match in predictions:
+        league = match.get('league', 'Sem Liga')
+        if leagues and league not in leagues:
+            continue
+        matches_by_league.setdefault(league, []).append(match)
+
+    message = f"☀️ *Resumo do dia - {datetime.now().strftime('%d/%m')}*\n\n"
+    if not matches_by_league:
+        return message + "Nenhum jogo das suas ligas hoje."
+
+    for league, league_matches in matches_by_league.items():
+        message += f"🏆 *{league}*\n"
+        for match in league_matches:
+            message += f"⚽ {match.get('home_team', 'Time A')} vs {match.get('away_team', 'Time B')}"
+            if match.get('time'):
+                message += f" - 🕐 {match['time']}"
+            message += "\n"
+            prob = match.get('probability')
+            if prob:
+                message += f"   🟢 {prob['home_win']}% ⚪ {prob['draw']}% 🔴 {prob['away_win']}%\n"
+        message += "\n"
+
+    return message.rstrip()
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """
+    Divide um texto em partes que cabem em uma mensagem do Telegram
+
+    Args:
+        text: Texto completo
+        limit: Tamanho máximo de cada parte
+
+    Returns:
+        Lista de partes, quebradas em fim de linha sempre que possível
+    """
+    chunks = []
+    current = ''
+    for line in text.split('\n'):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BroadcastCheckpoint:
+    """
+    Checkpoint de um broadcast em um arquivo de log somente-anexação
+
+    A primeira linha identifica o broadcast (ex: a data do resumo); a linha
+    de início é gravada assim que o envio começa e cada linha seguinte é um
+    chat já atendido. Os chats são gravados em lotes pequenos (por contagem
+    ou por tempo), então uma queda brusca reenvia no máximo um lote. Ao
+    reabrir o mesmo broadcast após uma queda, os chats registrados são pulados.
+    """
+
+    STARTED_MARKER = '#started'
+    DONE_MARKER = '#done'
+
+    def __init__(self, path: str, key: str, flush_every: int = 25, flush_interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.key = key
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self.done: Set[int] = set()
+        self.started = False
+        self.completed = False
+        self._buffer: List[int] = []
+        self._last_flush = clock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+
+        if lines and lines[0] == self.key:
+            for line in lines[1:]:
+                if line == self.STARTED_MARKER:
+                    self.started = True
+                elif line == self.DONE_MARKER:
+                    self.completed = True
+                elif line.strip().lstrip('-').isdigit():
+                    self.done.add(int(line))
+        else:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(f"{self.key}\n")
+
+    def _append(self, text: str) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def begin(self) -> None:
+        """Registra o início do broadcast (antes do primeiro envio)"""
+        if not self.started:
+            self._append(f"{self.STARTED_MARKER}\n")
+            self.started = True
+
+    def is_done(self, chat_id: int) -> bool:
+        return chat_id in self.done
+
+    def mark_done(self, chat_id: int) -> None:
+        """Registra um chat atendido, gravando em lotes pequenos no disco"""
+        self.done.add(chat_id)
+        self._buffer.append(chat_id)
+        if len(self._buffer) >= self.flush_every or self._clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = self._clock()
+        if not self._buffer:
+            return
+        self._append(''.join(f"{chat_id}\n" for chat_id in self._buffer))
+        self._buffer.clear()
+
+    def complete(self) -> None:
+        """Marca o broadcast como concluído"""
+        self.flush()
+        self._append(f"{self.DONE_MARKER}\n")
+        self.completed = True
+
+
+class RateLimiter:
+    """Limitador de taxa global que espaça os envios e pode ser pausado (429)"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_slot - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot = max(loop.time(), self._next_slot) + self.interval
+
+    def pause(self, seconds: float) -> None:
+        """Suspende todos os envios pelo tempo pedido pelo Telegram"""
+        loop = asyncio.get_running_loop()
+        self._next_slot = max(self._next_slot, loop.time() + seconds)
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    retry_after = error.retry_after
+    if hasattr(retry_after, 'total_seconds'):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+async def broadcast(deliveries: Iterable[Tuple[int, List[str]]],
+                    send: Callable[[int, str], Awaitable],
+                    checkpoint: Optional[BroadcastCheckpoint] = None,
+                    rate_per_second: float = 25,
+                    workers: int = 16,
+                    max_attempts: int = 5) -> Dict:
+    """
+    Envia mensagens para muitos chats respeitando os limites do Telegram
+
+    Args:
+        deliveries: Pares (chat_id, partes da mensagem)
+        send: Corrotina que envia um texto para um chat
+        checkpoint: Checkpoint para pular chats já atendidos e registrar progresso
+        rate_per_second: Mensagens por segundo no total
+        workers: Envios simultâneos
+        max_attempts: Tentativas por mensagem antes de desistir do chat
+
+    Returns:
+        Estatísticas do envio e a lista de chats que bloquearam o bot
+    """
+    limiter = RateLimiter(rate_per_second)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 4)
+    stats = {'sent': 0, 'skipped': 0, 'failed': 0, 'blocked': []}
+
+    async def send_with_retry(chat_id: int, text: str) -> None:
+        for attempt in range(max_attempts):
+            await limiter.acquire()
+            try:
+                await send(chat_id, text)
+                return
+            except RetryAfter as e:
+                seconds = _retry_after_seconds(e)
+                logger.warning(f"Limite do Telegram atingido, pausando envios por {seconds}s")
+                limiter.pause(seconds)
+        raise RuntimeError(f"Limite de tentativas excedido para o chat {chat_id}")
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            chat_id, chunks = item
+            try:
+                for chunk in chunks:
+                    await send_with_retry(chat_id, chunk)
+                stats['sent'] += 1
+            except Forbidden:
+                stats['blocked'].append(chat_id)
+            except Exception as e:
+                logger.warning(f"Falha ao enviar resumo para {chat_id}: {str(e)}")
+                stats['failed'] += 1
+            # Chats bloqueados ou com falha também não são reenviados na retomada
+            if checkpoint:
+                checkpoint.mark_done(chat_id)
+
+    if checkpoint:
+        checkpoint.begin()
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        for chat_id, chunks in deliveries:
+            if checkpoint and checkpoint.is_done(chat_id):
+                stats['skipped'] += 1
+                continue
+            await queue.put((chat_id, chunks))
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if checkpoint:
+            checkpoint.flush()
+
+    if checkpoint:
+        checkpoint.complete()
+    return stats
@@ -0,0 +1,145 @@
+"""
+Módulo de Execução em Camadas
+Separa o trabalho bloqueante dos handlers por tipo de carga: um pool de
+threads limitado para chamadas de rede (IO) e um pool de processos para
+tarefas pesadas de CPU, com métricas de fila por camada
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+IO = 'io'
+CPU = 'cpu'
+
+
+class TierStats:
+    """Métricas de uma camada de execução"""
+
+    def __init__(self):
+        self.waiting = 0        # Aguardando vaga na camada (fila cheia)
+        self.in_flight = 0      # Enviados ao pool (na fila do pool ou executando)
+        self.max_depth = 0      # Maior valor de waiting + in_flight observado
+        self.max_in_flight = 0  # Nunca passa de workers + queue_limit
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    def snapshot(self) -> Dict:
+        done = self.completed + self.failed
+        return {
+            'waiting': self.waiting,
+            'in_flight': self.in_flight,
+            'max_depth': self.max_depth,
+            'max_in_flight': self.max_in_flight,
+            'completed': self.completed,
+            'failed': self.failed,
+            'avg_wait_ms': round(self.total_wait / done * 1000, 2) if done else 0.0,
+            'avg_run_ms': round(self.total_run / done * 1000, 2) if done else 0.0,
+        }
+
+
+class TieredExecutor:
+    """
+    Executor com uma camada de IO (threads) e uma de CPU (processos)
+
+    Cada camada aceita no máximo `workers + queue_limit` tarefas ao mesmo
+    tempo; acima disso o handler espera por uma vaga em vez de acumular
+    trabalho sem limite. Funções enviadas à camada de CPU precisam ser
+    serializáveis (definidas no nível do módulo).
+    """
+
+    def __init__(self, io_workers: int = 16, cpu_workers: int = 2,
+                 io_queue_limit: int = 256, cpu_queue_limit: int = 32):
+        self._limits = {IO: io_workers + io_queue_limit, CPU: cpu_workers + cpu_queue_limit}
+        self._workers = {IO: io_workers, CPU: cpu_workers}
+        self._pools: Dict[str, Executor] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {IO: TierStats(), CPU: TierStats()}
+
+    def _pool(self, tier: str) -> Executor:
+        """Cria o pool da camada sob demanda (processos só sobem se forem usados)"""
+        pool = self._pools.get(tier)
+        if pool is None:
+            if tier == IO:
+                pool = ThreadPoolExecutor(max_workers=self._workers[IO], thread_name_prefix='io')
+            else:
+                # Sem fork: quando o pool sobe, o processo já tem threads (IO, hedge) e um
+                # filho criado por fork pode herdar um lock travado (ex: do logging)
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                pool = ProcessPoolExecutor(
+                    max_workers=self._workers[CPU], mp_context=multiprocessing.get_context(method),
+                )
+            self._pools[tier] = pool
+        return pool
+
+    async def run(self, tier: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Executa uma função bloqueante na camada indicada
+
+        Args:
+            tier: IO (rede, disco) ou CPU (modelos, parsing, simulações)
+            fn: Função a executar
+            *args, **kwargs: Argumentos da função
+
+        Returns:
+            O retorno da função
+        """
+        if tier not in self._limits:
+            raise ValueError(f"Camada de execução inválida: {tier}")
+
+        semaphore = self._semaphores.get(tier)
+        if semaphore is None:
+            semaphore = self._semaphores[tier] = asyncio.Semaphore(self._limits[tier])
+        stats = self.stats[tier]
+
+        stats.waiting += 1
+        stats.max_depth = max(stats.max_depth, stats.waiting + stats.in_flight)
+        queued_at = time.monotonic()
+        try:
+            await semaphore.acquire()
+        finally:
+            # Também quando a tarefa é cancelada enquanto espera a vaga
+            stats.waiting -= 1
+
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        started_at = time.monotonic()
+        stats.total_wait += started_at - queued_at
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._pool(tier), functools.partial(fn, *args, **kwargs))
+        except Exception:
+            stats.failed += 1
+            raise
+        else:
+            stats.completed += 1
+            return result
+        finally:
+            stats.in_flight -= 1
+            stats.total_run += time.monotonic() - started_at
+            semaphore.release()
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Executa uma chamada de rede ou disco no pool de threads"""
+        return await self.run(IO, fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Executa uma tarefa pesada de CPU no pool de processos"""
+        return await self.run(CPU, fn, *args, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Métricas de fila e tempo de cada camada"""
+        return {tier: stats.snapshot() for tier, stats in self.stats.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        self._pools.clear()
@@ -0,0 +1,393 @@
+"""
+Servidor Local que Simula a Bot API do Telegram
+Permite rodar e testar a carga do bot sem acessar o Telegram real
+
+Implementa getMe, getUpdates (long polling), setWebhook/deleteWebhook,
+sendMessage, editMessageText, answerCallbackQuery e answerInlineQuery,
+respondendo 429 (Too Many Requests) com retry_after como o Telegram faz
+quando os limites por chat ou global são excedidos. Também responde a
+/v1/chat/completions para que o fluxo /analisar funcione sem a API de IA.
+
+Uso isolado:
+    python3 fake_telegram.py --port 8081
+    TELEGRAM_API_BASE_URL=http://127.0.0.1:8081/bot python3 bot.py
+"""
+
+import argparse
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qsl
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+# Campos enviados pela biblioteca como JSON dentro do formulário
+JSON_FIELDS = {'reply_markup', 'results', 'allowed_updates', 'entities', 'button'}
+INT_FIELDS = {'chat_id', 'message_id', 'offset', 'limit', 'timeout', 'cache_time'}
+
+
+class TokenBucket:
+    """Balde de fichas usado para simular os limites de envio do Telegram"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Tenta consumir uma ficha
+
+        Returns:
+            0 se havia ficha, ou os segundos até a próxima ficha
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class FakeTelegramState:
+    """Estado do servidor: fila de updates, mensagens e limites de taxa"""
+
+    def __init__(self, chat_rate: float = 1.0, chat_burst: float = 3,
+                 global_rate: float = 30.0, global_burst: float = 30):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._global_bucket = TokenBucket(global_rate, global_burst)
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+        self._updates = deque()
+        self._cond = threading.Condition()
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self._callback_chats: Dict[str, int] = {}
+        self.webhook_url: Optional[str] = None
+        # Ouvintes chamados a cada envio do bot: (método, chat_id, limitado, texto)
+        self.listeners: List[Callable[[str, Optional[int], bool, str], None]] = []
+        self.stats = {'calls': 0, 'throttled': 0}
+
+    # --- Lado do usuário (gerador de carga) ---
+
+    def push_update(self, update: Dict) -> int:
+        """Enfileira um update para o bot (ou envia ao webhook, se configurado)"""
+        with self._cond:
+            update['update_id'] = self._next_update_id
+            self._next_update_id += 1
+            if 'callback_query' in update:
+                query = update['callback_query']
+                self._callback_chats[query['id']] = query['message']['chat']['id']
+            webhook_url = self.webhook_url
+            if not webhook_url:
+                self._updates.append(update)
+                self._cond.notify_all()
+        if webhook_url:
+            threading.Thread(target=self._deliver_webhook, args=(webhook_url, update), daemon=True).start()
+        return update['update_id']
+
+    def _deliver_webhook(self, url: str, update: Dict) -> None:
+        try:
+            request = Request(url, data=json.dumps(update).encode('utf-8'),
+                              headers={'Content-Type': 'application/json'})
+            urlopen(request, timeout=10).read()
+        except Exception as e:
+            logger.warning(f"Falha ao entregar update ao webhook: {str(e)}")
+
+    def next_message_id(self) -> int:
+        with self._cond:
+            self._next_message_id += 1
+            return self._next_message_id
+
+    # --- Lado do bot (métodos da API) ---
+
+    def get_updates(self, offset: int = 0, limit: int = 100, timeout: float = 0) -> List[Dict]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                while self._updates and self._updates[0]['update_id'] < offset:
+                    self._updates.popleft()
+                if self._updates:
+                    return list(self._updates)[:limit]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+
+    def throttle(self, chat_id: Optional[int]) -> float:
+        """Aplica os limites por chat e global; retorna o retry_after (0 = liberado)"""
+        with self._cond:
+            self.stats['calls'] += 1
+            wait = self._global_bucket.take()
+            if not wait and chat_id is not None:
+                bucket = self._chat_buckets.get(chat_id)
+                if bucket is None:
+                    bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+                wait = bucket.take()
+            if wait:
+                self.stats['throttled'] += 1
+            return wait
+
+    def notify(self, method: str, chat_id: Optional[int], throttled: bool, text: str = '') -> None:
+        for listener in list(self.listeners):
+            listener(method, chat_id, throttled, text)
+
+    def callback_chat(self, callback_query_id: str) -> Optional[int]:
+        with self._cond:
+            return self._callback_chats.get(callback_query_id)
+
+
+def _user(user_id: int) -> Dict:
+    return {'id': user_id, 'is_bot': False, 'first_name': f"Usuário {user_id}", 'language_code': 'pt-br'}
+
+
+def make_message_update(user_id: int, text: str, message_id: int) -> Dict:
+    """Cria um update de mensagem (comandos recebem a entidade bot_command)"""
+    message = {
+        'message_id': message_id,
+        'date': int(time.time()),
+        'chat': {'id': user_id, 'type': 'private'},
+        'from': _user(user_id),
+        'text': text,
+    }
+    if text.startswith('/'):
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+    return {'message': message}
+
+
+def make_callback_update(user_id: int, data: str, message_id: int) -> Dict:
+    """Cria um update de clique em botão inline"""
+    return {
+        'callback_query': {
+            'id': f"{user_id}-{message_id}-{time.monotonic_ns()}",
+            'from': _user(user_id),
+            'chat_instance': str(user_id),
+            'data': data,
+            'message': {
+                'message_id': message_id,
+                'date': int(time.time()),
+                'chat': {'id': user_id, 'type': 'private'},
+                'from': {'id': 1, 'is_bot': True, 'first_name': 'Bot'},
+                'text': '...',
+            },
+        }
+    }
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """Handler HTTP da Bot API simulada"""
+
+    protocol_version = 'HTTP/1.1'
+    state: FakeTelegramState = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _read_params(self) -> Dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        content_type = self.headers.get('Content-Type', '')
+        if 'application/json' in content_type:
+            return json.loads(body or b'{}')
+
+        params = {}
+        for key, value in parse_qsl(body.decode('utf-8'), keep_blank_values=True):
+            if key in JSON_FIELDS:
+                value = json.loads(value)
+            elif key in INT_FIELDS:
+                try:
+                    value = int(value)
+                except ValueError:
+                    pass
+            params[key] = value
+        return params
+
+    def _reply(self, payload: Dict, status: int = 200) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.do_POST()
+
+    def do_POST(self):
+        try:
+            params = self._read_params()
+        except ValueError:
+            self._reply({'ok': False, 'error_code': 400, 'description': 'Bad Request'}, 400)
+            return
+
+        if self.path.rstrip('/').endswith('/chat/completions'):
+            self._reply(self._chat_completion(params))
+            return
+
+        method = self.path.rstrip('/').rsplit('/', 1)[-1]
+        handler = getattr(self, f"api_{method}", None)
+        if handler is None:
+            self._reply({'ok': True, 'result': True})
+            return
+        handler(params)
+
+    def _limited(self, method: str, chat_id: Optional[int], text: str = '') -> bool:
+        """Responde 429 se o limite foi excedido; retorna True nesse caso"""
+        wait = self.state.throttle(chat_id)
+        self.state.notify(method, chat_id, bool(wait), text)
+        if not wait:
+            return False
+        retry_after = max(1, math.ceil(wait))
+        self._reply({
+            'ok': False,
+            'error_code': 429,
+            'description': f"Too Many Requests: retry after {retry_after}",
+            'parameters': {'retry_after': retry_after},
+        }, 429)
+        return True
+
+    def _bot_message(self, chat_id: int, text: str, message_id: Optional[int] = None) -> Dict:
+        return {
+            'message_id': message_id or self.state.next_message_id(),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': {'id': 1, 'is_bot': True, 'first_name': 'Bot', 'username': 'fake_bot'},
+            'text': text,
+        }
+
+    def api_getMe(self, params):
+        self._reply({'ok': True, 'result': {
+            'id': 1, 'is_bot': True, 'first_name': 'Bot', 'username': 'fake_bot',
+            'can_join_groups': True, 'can_read_all_group_messages': False,
+            'supports_inline_queries': True,
+        }})
+
+    def api_getUpdates(self, params):
+        updates = self.state.get_updates(
+            offset=int(params.get('offset') or 0),
+            limit=int(params.get('limit') or 100),
+            timeout=float(params.get('timeout') or 0),
+        )
+        self._reply({'ok': True, 'result': updates})
+
+    def api_setWebhook(self, params):
+        self.state.webhook_url = params.get('url') or None
+        self._reply({'ok': True, 'result': True})
+
+    def api_deleteWebhook(self, params):
+        self.state.webhook_url = None
+        self._reply({'ok': True, 'result': True})
+
+    def api_getWebhookInfo(self, params):
+        self._reply({'ok': True, 'result': {
+            'url': self.state.webhook_url or '', 'has_custom_certificate': False,
+            'pending_update_count': 0,
+        }})
+
+    def api_sendMessage(self, params):
+        chat_id = params.get('chat_id')
+        if self._limited('sendMessage', chat_id, params.get('text', '')):
+            return
+        self._reply({'ok': True, 'result': self._bot_message(chat_id, params.get('text', ''))})
+
+    def api_editMessageText(self, params):
+        chat_id = params.get('chat_id')
+        if self._limited('editMessageText', chat_id, params.get('text', '')):
+            return
+        self._reply({'ok': True, 'result': self._bot_message(
+            chat_id, params.get('text', ''), message_id=params.get('message_id'))})
+
+    def api_answerCallbackQuery(self, params):
+        chat_id = self.state.callback_chat(params.get('callback_query_id'))
+        if self._limited('answerCallbackQuery', chat_id):
+            return
+        self._reply({'ok': True, 'result': True})
+
+    def api_answerInlineQuery(self, params):
+        if self._limited('answerInlineQuery', None):
+            return
+        self._reply({'ok': True, 'result': True})
+
+    def _chat_completion(self, params: Dict) -> Dict:
+        return {
+            'id': 'chatcmpl-fake',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': params.get('model', 'fake'),
+            'choices': [{
+                'index': 0,
+                'finish_reason': 'stop',
+                'message': {'role': 'assistant', 'content': "*Análise simulada.* Resposta do servidor local."},
+            }],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+        }
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """Servidor que não polui a saída quando o bot fecha conexões abertas"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        logger.debug(f"Conexão encerrada por {client_address}")
+
+
+class FakeTelegramServer:
+    """Servidor HTTP da Bot API simulada, executado em uma thread"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, state: Optional[FakeTelegramState] = None):
+        self.state = state or FakeTelegramState()
+        handler = type('BoundFakeTelegramHandler', (FakeTelegramHandler,), {'state': self.state})
+        self.httpd = _QuietHTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """URL base para Application.builder().base_url(...)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    @property
+    def openai_base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeTelegramServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    """Executa o servidor simulado pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Bot API do Telegram simulada")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    server = FakeTelegramServer(args.host, args.port)
+    logger.info(f"Bot API simulada em {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
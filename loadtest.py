@@ -0,0 +1,265 @@
+"""
+Teste de Carga do Bot
+Sobe a Bot API simulada (fake_telegram.py), inicia o bot.py apontando para
+ela e simula milhares de usuários simultâneos executando /jogos (com
+navegação de página), /probabilidades, /ligas (com clique no botão) e o
+fluxo /analisar.
+
+Ao final informa vazão, latências p50/p99 (primeira resposta e conclusão
+de cada ação), timeouts, respostas de erro do bot e a taxa de 429.
+
+Uso:
+    python3 loadtest.py --users 1000 --ramp 10
+    python3 loadtest.py --users 200 --no-spawn   # bot já rodando com TELEGRAM_API_BASE_URL
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from fake_telegram import FakeTelegramServer, make_callback_update, make_message_update
+
+logger = logging.getLogger(__name__)
+
+# Ações de cada usuário simulado: (rótulo, tipo, conteúdo)
+SCENARIO = [
+    ('/jogos', 'message', '/jogos'),
+    ('jogos ▶ (callback)', 'callback', 'jg|a|1'),
+    ('/probabilidades', 'message', '/probabilidades'),
+    ('/ligas', 'message', '/ligas'),
+    ('liga (callback)', 'callback', 'liga_premier'),
+    ('/analisar', 'message', '/analisar'),
+    ('/analisar (pergunta)', 'message', 'Qual a chance do Flamengo vencer hoje?'),
+    ('/analisar (acompanhamento)', 'message', 'E a chance de empate?'),
+]
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Percentil simples (vizinho mais próximo)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class ChatTracker:
+    """Acompanha as respostas do bot em um chat simulado"""
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.last_response = 0.0
+        self.responses = 0
+
+
+class LoadGenerator:
+    """Gera carga sobre o bot através da Bot API simulada"""
+
+    def __init__(self, server: FakeTelegramServer, timeout: float = 30.0, settle: float = 1.0,
+                 think_time: float = 0.5):
+        self.server = server
+        self.timeout = timeout
+        self.settle = settle
+        self.think_time = think_time
+        self.chats: Dict[int, ChatTracker] = {}
+        self.results: Dict[str, Dict[str, List[float]]] = {}
+        self.timeouts = 0
+        self.error_replies = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._message_id = 0
+
+    def _on_bot_call(self, method: str, chat_id: Optional[int], throttled: bool, text: str = '') -> None:
+        """Chamado pelas threads do servidor a cada envio do bot"""
+        if throttled or chat_id is None or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._record_response, chat_id, text)
+
+    def _record_response(self, chat_id: int, text: str) -> None:
+        tracker = self.chats.get(chat_id)
+        if tracker is None:
+            return
+        tracker.last_response = time.monotonic()
+        tracker.responses += 1
+        if text.startswith('❌'):
+            self.error_replies += 1
+        tracker.event.set()
+
+    def _record(self, label: str, first: float, done: float) -> None:
+        entry = self.results.setdefault(label, {'first': [], 'done': []})
+        entry['first'].append(first)
+        entry['done'].append(done)
+
+    async def _wait_quiet(self, tracker: ChatTracker) -> None:
+        """Espera o chat ficar `settle` segundos sem novas respostas"""
+        while True:
+            tracker.event.clear()
+            try:
+                await asyncio.wait_for(tracker.event.wait(), self.settle)
+            except asyncio.TimeoutError:
+                return
+
+    async def run_action(self, user_id: int, label: str, kind: str, content: str) -> bool:
+        tracker = self.chats[user_id]
+        tracker.event.clear()
+        responses_before = tracker.responses
+        self._message_id += 1
+        if kind == 'callback':
+            update = make_callback_update(user_id, content, self._message_id)
+        else:
+            update = make_message_update(user_id, content, self._message_id)
+
+        start = time.monotonic()
+        self.server.state.push_update(update)
+        try:
+            while tracker.responses == responses_before:
+                await asyncio.wait_for(tracker.event.wait(), self.timeout - (time.monotonic() - start))
+                tracker.event.clear()
+        except (asyncio.TimeoutError, ValueError):
+            self.timeouts += 1
+            return False
+
+        first = tracker.last_response - start
+        await self._wait_quiet(tracker)
+        self._record(label, first, tracker.last_response - start)
+        return True
+
+    async def run_user(self, user_id: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self.chats[user_id] = ChatTracker()
+        for label, kind, content in SCENARIO:
+            if not await self.run_action(user_id, label, kind, content):
+                break
+            await asyncio.sleep(self.think_time)
+
+    async def wait_for_bot(self, startup_timeout: float) -> bool:
+        """Envia /start até o bot responder (ou esgotar o tempo)"""
+        self.chats[0] = ChatTracker()
+        saved_timeout, self.timeout = self.timeout, startup_timeout
+        try:
+            return await self.run_action(0, '/start', 'message', '/start')
+        finally:
+            self.timeout = saved_timeout
+            self.results.pop('/start', None)
+
+    async def run(self, users: int, ramp: float, startup_timeout: float = 60.0) -> Dict:
+        self._loop = asyncio.get_running_loop()
+        self.server.state.listeners.append(self._on_bot_call)
+        try:
+            if not await self.wait_for_bot(startup_timeout):
+                raise RuntimeError("O bot não respondeu ao /start")
+
+            calls_before = dict(self.server.state.stats)
+            start = time.monotonic()
+            await asyncio.gather(*(
+                self.run_user(1000 + i, ramp * i / max(users, 1)) for i in range(users)
+            ))
+            elapsed = time.monotonic() - start
+        finally:
+            self.server.state.listeners.remove(self._on_bot_call)
+        return self.report(users, elapsed, calls_before)
+
+    def report(self, users: int, elapsed: float, calls_before: Dict) -> Dict:
+        stats = self.server.state.stats
+        calls = stats['calls'] - calls_before['calls']
+        throttled = stats['throttled'] - calls_before['throttled']
+        completed = sum(len(entry['first']) for entry in self.results.values())
+        attempted = completed + self.timeouts
+
+        def summarize(values):
+            return {
+                'p50': round(percentile(values, 50), 3) if values else None,
+                'p99': round(percentile(values, 99), 3) if values else None,
+            }
+
+        return {
+            'users': users,
+            'elapsed_s': round(elapsed, 2),
+            'actions_completed': completed,
+            'throughput_actions_per_s': round(completed / elapsed, 2) if elapsed else None,
+            'timeout_rate': round(self.timeouts / attempted, 4) if attempted else 0.0,
+            'error_replies': self.error_replies,
+            'bot_api_calls': calls,
+            'rate_limited_429': throttled,
+            'rate_limited_ratio': round(throttled / calls, 4) if calls else 0.0,
+            'latency_first_response_s': summarize([v for e in self.results.values() for v in e['first']]),
+            'latency_completed_s': summarize([v for e in self.results.values() for v in e['done']]),
+            'by_action': {
+                label: {'count': len(entry['first']),
+                        'first_response_s': summarize(entry['first']),
+                        'completed_s': summarize(entry['done'])}
+                for label, entry in self.results.items()
+            },
+        }
+
+
+def spawn_bot(server: FakeTelegramServer, workdir: str) -> subprocess.Popen:
+    """Inicia o bot.py (main() como configurado) apontando para o servidor simulado"""
+    env = dict(os.environ)
+    env['TELEGRAM_API_BASE_URL'] = server.base_url
+    env['OPENAI_API_KEY'] = 'fake-key'
+    env['OPENAI_BASE_URL'] = server.openai_base_url
+    bot_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot.py')
+    log = open(os.path.join(workdir, 'bot.log'), 'wb')
+    # O diretório de trabalho temporário isola snapshots e checkpoints do bot
+    return subprocess.Popen([sys.executable, bot_path], cwd=workdir, env=env, stdout=log, stderr=log)
+
+
+def print_report(report: Dict) -> None:
+    print(f"\nUsuários: {report['users']}  |  Duração: {report['elapsed_s']}s")
+    print(f"Vazão: {report['throughput_actions_per_s']} ações/s ({report['actions_completed']} ações)")
+    print(f"Timeouts: {report['timeout_rate'] * 100:.2f}%  |  Respostas de erro: {report['error_replies']}")
+    print(f"429: {report['rate_limited_429']} de {report['bot_api_calls']} chamadas "
+          f"({report['rate_limited_ratio'] * 100:.2f}%)")
+    first, done = report['latency_first_response_s'], report['latency_completed_s']
+    print(f"Latência 1ª resposta: p50={first['p50']}s p99={first['p99']}s")
+    print(f"Latência conclusão:   p50={done['p50']}s p99={done['p99']}s\n")
+    print(f"{'Ação':<24}{'n':>7}{'p50 1ª':>10}{'p99 1ª':>10}{'p50 fim':>10}{'p99 fim':>10}")
+    for label, entry in report['by_action'].items():
+        print(f"{label:<24}{entry['count']:>7}"
+              f"{entry['first_response_s']['p50']:>10}{entry['first_response_s']['p99']:>10}"
+              f"{entry['completed_s']['p50']:>10}{entry['completed_s']['p99']:>10}")
+
+
+def main():
+    """Executa o teste de carga pela linha de comando"""
+    parser = argparse.ArgumentParser(description="Teste de carga do bot com a Bot API simulada")
+    parser.add_argument('--users', type=int, default=1000, help="Usuários simulados")
+    parser.add_argument('--ramp', type=float, default=10.0, help="Segundos para iniciar todos os usuários")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Tempo máximo pela 1ª resposta")
+    parser.add_argument('--settle', type=float, default=1.0, help="Silêncio que encerra uma ação")
+    parser.add_argument('--think-time', type=float, default=0.5, help="Pausa entre ações do usuário")
+    parser.add_argument('--port', type=int, default=0, help="Porta do servidor simulado (0 = livre)")
+    parser.add_argument('--no-spawn', action='store_true', help="Não iniciar o bot (já está rodando)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    server = FakeTelegramServer(port=args.port).start()
+    logger.info(f"Bot API simulada em {server.base_url}")
+    workdir = tempfile.mkdtemp(prefix='football_bot_load_')
+    bot_process = None if args.no_spawn else spawn_bot(server, workdir)
+
+    try:
+        generator = LoadGenerator(server, timeout=args.timeout, settle=args.settle,
+                                  think_time=args.think_time)
+        report = asyncio.run(generator.run(args.users, args.ramp))
+        print_report(report)
+    finally:
+        if bot_process:
+            bot_process.terminate()
+            bot_process.wait(timeout=15)
+            logger.info(f"Log do bot em {os.path.join(workdir, 'bot.log')}")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Módulo de Paginação do /jogos
+Renderiza páginas da lista de jogos com cache por (filtro, página, versão
+dos dados) e codifica a navegação em callback_data pequeno e sem estado
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Prefixo do callback_data da navegação: "jg|<filtro>|<página>"
+CALLBACK_PREFIX = 'jg'
+FILTER_ALL = 'a'            # Todas as ligas
+FILTER_PREFERENCES = 'p'    # Ligas escolhidas em /ligas
+
+
+class LRUCache:
+    """Cache LRU simples com número máximo de entradas"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable):
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return None
+        return self._data[key]
+
+    def put(self, key: Hashable, value) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def encode_callback(filter_code: str, page: int) -> str:
+    """Monta o callback_data de um botão de navegação (bem abaixo de 64 bytes)"""
+    return f"{CALLBACK_PREFIX}|{filter_code}|{page}"
+
+
+def decode_callback(data: str) -> Optional[Tuple[str, int]]:
+    """
+    Lê o callback_data de um botão de navegação
+
+    Returns:
+        (filtro, página) ou None se o callback_data for inválido
+    """
+    try:
+        prefix, filter_code, page = data.split('|')
+        if prefix != CALLBACK_PREFIX or filter_code not in (FILTER_ALL, FILTER_PREFERENCES):
+            return None
+        return filter_code, max(0, int(page))
+    except (AttributeError, ValueError):
+        return None
+
+
+def sort_matches(matches: List[Dict], leagues: Tuple[str, ...] = ()) -> List[Dict]:
+    """
+    Filtra e ordena os jogos para paginação (por liga e horário)
+
+    Args:
+        matches: Jogos do dia
+        leagues: Ligas a incluir (vazio = todas)
+
+    Returns:
+        Lista ordenada usada por todas as páginas desse filtro
+    """
+    selected = [m for m in matches if not leagues or m.get('league') in leagues]
+    return sorted(selected, key=lambda m: (m.get('league') or '', m.get('time') or '', m.get('home_team') or ''))
+
+
+def render_page(matches: List[Dict], page: int, page_size: int) -> Tuple[str, int, int]:
+    """
+    Renderiza uma página da lista de jogos
+
+    Args:
+        matches: Lista já filtrada e ordenada (sort_matches)
+        page: Página pedida (ajustada para o intervalo válido)
+        page_size: Jogos por página
+
+    Returns:
+        (texto em Markdown, página renderizada, total de páginas)
+    """
+    total_pages = max(1, -(-len(matches) // page_size))
+    page = min(max(page, 0), total_pages - 1)
+    start = page * page_size
+
+    message = f"⚽ *Jogos de hoje* ({len(matches)}) - página {page + 1}/{total_pages}\n"
+    current_league = None
+    for match in matches[start:start + page_size]:
+        league = match.get('league', 'Sem Liga')
+        if league != current_league:
+            message += f"\n🏆 *{league}*\n"
+            current_league = league
+        message += f"⚽ {match.get('home_team', 'Time A')} vs {match.get('away_team', 'Time B')}"
+        if match.get('time'):
+            message += f" - 🕐 {match['time']}"
+        if match.get('score'):
+            message += f" - 📊 {match['score']}"
+        message += "\n"
+
+    return message, page, total_pages
+
+
+def navigation_buttons(filter_code: str, page: int, total_pages: int) -> List[Tuple[str, str]]:
+    """
+    Botões ◀/▶ da página
+
+    Returns:
+        Pares (texto, callback_data); vazio se houver uma única página
+    """
+    if total_pages <= 1:
+        return []
+    buttons = []
+    if page > 0:
+        buttons.append(("◀️", encode_callback(filter_code, page - 1)))
+    buttons.append((f"{page + 1}/{total_pages}", encode_callback(filter_code, page)))
+    if page < total_pages - 1:
+        buttons.append(("▶️", encode_callback(filter_code, page + 1)))
+    return buttons
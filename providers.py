@@ -0,0 +1,341 @@
+"""
+Módulo de Roteamento entre Provedores de Dados
+Circuit breaker por provedor, estatísticas de saúde, requisições "hedged"
+e roteamento consciente de cota entre as fontes de dados de futebol
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Erro lançado quando o circuito de um provedor está aberto"""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker clássico com os estados closed, open e half_open
+
+    - closed: requisições passam normalmente; falhas consecutivas são contadas
+    - open: requisições são recusadas imediatamente até o fim do cooldown
+    - half_open: uma única requisição de teste é liberada; sucesso fecha o
+      circuito, falha o reabre
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Estado atual, promovendo open -> half_open quando o cooldown expira"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Indica se uma requisição pode ser feita agora
+
+        Returns:
+            True se o circuito permite a requisição
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """Devolve a requisição de teste do half_open quando ela não chega a ser feita"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        """Registra um sucesso e fecha o circuito"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Registra uma falha, abrindo o circuito se necessário"""
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+
+class ProviderStats:
+    """Estatísticas de saúde de um provedor (latência, sucessos e falhas)"""
+
+    def __init__(self, window: int = 100):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.successes = 0
+        self.failures = 0
+
+    def record(self, latency: float, success: bool) -> None:
+        """Registra o resultado de uma requisição"""
+        with self._lock:
+            if success:
+                self.successes += 1
+                self._latencies.append(latency)
+            else:
+                self.failures += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Calcula um percentil da latência das requisições bem-sucedidas
+
+        Args:
+            pct: Percentil entre 0 e 100
+
+        Returns:
+            Latência em segundos ou None sem amostras
+        """
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    @property
+    def error_rate(self) -> float:
+        total = self.successes + self.failures
+        return self.failures / total if total else 0.0
+
+
+class Provider:
+    """Um provedor de dados com seu circuit breaker, estatísticas e cota diária"""
+
+    def __init__(self, name: str, base_url: str, daily_quota: Optional[int] = None,
+                 breaker: Optional[CircuitBreaker] = None, headers: Optional[Dict] = None):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.daily_quota = daily_quota
+        self.headers = headers or {}
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = ProviderStats()
+        self._quota_lock = threading.Lock()
+        self._quota_day = date.today()
+        self._used_today = 0
+
+    def remaining_quota(self) -> Optional[int]:
+        """Requisições restantes hoje (None = ilimitado)"""
+        if self.daily_quota is None:
+            return None
+        with self._quota_lock:
+            self._roll_quota_day()
+            return max(0, self.daily_quota - self._used_today)
+
+    def consume_quota(self) -> bool:
+        """
+        Reserva uma requisição da cota diária
+
+        Returns:
+            True se havia cota disponível
+        """
+        with self._quota_lock:
+            self._roll_quota_day()
+            if self.daily_quota is not None and self._used_today >= self.daily_quota:
+                return False
+            self._used_today += 1
+            return True
+
+    def _roll_quota_day(self) -> None:
+        today = date.today()
+        if today != self._quota_day:
+            self._quota_day = today
+            self._used_today = 0
+
+    def health(self) -> Dict:
+        """Resumo de saúde do provedor para logs e diagnóstico"""
+        return {
+            'name': self.name,
+            'state': self.breaker.state,
+            'successes': self.stats.successes,
+            'failures': self.stats.failures,
+            'error_rate': round(self.stats.error_rate, 3),
+            'p95_latency': self.stats.percentile(95),
+            'remaining_quota': self.remaining_quota(),
+        }
+
+
+class ProviderRouter:
+    """
+    Roteia requisições entre provedores
+
+    Escolhe primeiro os provedores com circuito fechado e mais cota restante.
+    Se o provedor primário ultrapassa sua latência p95, dispara uma requisição
+    "hedged" no próximo provedor e usa a primeira resposta válida. O atraso do
+    hedge conta a partir do início da chamada, não do envio ao pool, para que
+    o tempo de fila sob carga não seja confundido com lentidão do provedor;
+    se a chamada nem começa dentro desse atraso, o hedge sai mesmo assim.
+    Hedges usam um pool próprio, então não ficam atrás de chamadas primárias
+    presas em um provedor degradado.
+    """
+
+    def __init__(self, providers: List[Provider], hedge_after: Optional[float] = None,
+                 max_workers: int = 4):
+        self.providers = providers
+        # Atraso padrão do hedge enquanto o provedor ainda não tem amostras
+        self.hedge_after = hedge_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='provider')
+        self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                  thread_name_prefix='provider-hedge')
+
+    def ranked_providers(self) -> List[Provider]:
+        """
+        Ordena os provedores disponíveis para a próxima requisição
+
+        Returns:
+            Provedores sem circuito aberto e com cota, do melhor para o pior
+        """
+        def sort_key(provider: Provider):
+            remaining = provider.remaining_quota()
+            budget = 1.0 if remaining is None else remaining / max(provider.daily_quota, 1)
+            p95 = provider.stats.percentile(95)
+            return (
+                provider.breaker.state != CircuitBreaker.CLOSED,
+                -budget,
+                p95 if p95 is not None else float('inf'),
+            )
+
+        candidates = [
+            p for p in self.providers
+            if p.breaker.state != CircuitBreaker.OPEN and p.remaining_quota() != 0
+        ]
+        return sorted(candidates, key=sort_key)
+
+    def _call(self, provider: Provider, fetch: Callable[[Provider], Any],
+              started: Optional[threading.Event] = None) -> Any:
+        """Executa a requisição em um provedor atualizando breaker, estatísticas e cota"""
+        if started:
+            started.set()
+        if not provider.breaker.allow_request():
+            raise CircuitOpenError(provider.name)
+        if not provider.consume_quota():
+            # Sem cota a requisição não acontece; a vaga de teste do half_open não pode ficar presa
+            provider.breaker.release_probe()
+            raise CircuitOpenError(f"{provider.name}: cota diária esgotada")
+
+        start = time.monotonic()
+        try:
+            result = fetch(provider)
+        except Exception:
+            provider.stats.record(time.monotonic() - start, success=False)
+            provider.breaker.record_failure()
+            raise
+
+        if result is None:
+            provider.stats.record(time.monotonic() - start, success=False)
+            provider.breaker.record_failure()
+            raise ValueError(f"{provider.name}: resposta vazia")
+
+        provider.stats.record(time.monotonic() - start, success=True)
+        provider.breaker.record_success()
+        return result
+
+    def fetch(self, fetch: Callable[[Provider], Any]) -> Optional[Any]:
+        """
+        Executa uma requisição usando o melhor provedor, com hedge e failover
+
+        Args:
+            fetch: Função que recebe um Provider e retorna o JSON ou None
+
+        Returns:
+            Primeira resposta válida ou None se todos os provedores falharem
+        """
+        queue = self.ranked_providers()
+        if not queue:
+            logger.warning("Nenhum provedor disponível (circuitos abertos ou cotas esgotadas)")
+            return None
+
+        pending = {}
+        started = {}
+        deadlines = {}
+
+        def submit(provider: Provider, hedge: bool = False) -> None:
+            event = threading.Event()
+            executor = self._hedge_executor if hedge else self._executor
+            future = executor.submit(self._call, provider, fetch, event)
+            pending[future] = provider
+            started[future] = event
+
+        while queue or pending:
+            if not pending:
+                submit(queue.pop(0))
+
+            primary_future, primary = next(iter(pending.items()))
+            hedge_delay = primary.stats.percentile(95) or self.hedge_after
+            timeout = None
+            if queue and hedge_delay is not None:
+                if primary_future not in deadlines:
+                    # Espera a chamada sair da fila do pool antes de contar o atraso,
+                    # mas no máximo o próprio atraso: fila longa também dispara o hedge
+                    if started[primary_future].wait(hedge_delay):
+                        deadlines[primary_future] = time.monotonic() + hedge_delay
+                    else:
+                        deadlines[primary_future] = time.monotonic()
+                timeout = max(0.0, deadlines[primary_future] - time.monotonic())
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # O provedor atual está mais lento que seu p95: dispara o hedge
+                provider = queue.pop(0)
+                logger.info(f"Hedge: {primary.name} excedeu {hedge_delay:.2f}s, consultando {provider.name}")
+                submit(provider, hedge=True)
+                deadlines[primary_future] = time.monotonic() + hedge_delay
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"Provedor {provider.name} falhou: {str(e)}")
+                    continue
+                # Chamadas ainda na fila são canceladas; as que já começaram seguem em
+                # segundo plano (limitadas pelo timeout da requisição) só para as estatísticas
+                for other in pending:
+                    other.cancel()
+                return result
+
+        logger.error("Todos os provedores falharam")
+        return None
+
+    def health(self) -> List[Dict]:
+        """Resumo de saúde de todos os provedores"""
+        return [p.health() for p in self.providers]
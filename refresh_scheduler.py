@@ -0,0 +1,239 @@
+"""
+Módulo de Atualização Adaptativa dos Jogos
+Agenda a atualização de cada jogo em um heap conforme o status e a
+proximidade do início, dentro de um orçamento global de requisições
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = {'live', 'in_play', 'paused', 'halftime', '1h', '2h', 'ht', 'et'}
+FINISHED_STATUSES = {'finished', 'ft', 'awarded', 'cancelled', 'canceled', 'postponed', 'suspended'}
+
+# Intervalos padrão (segundos) por situação do jogo
+DEFAULT_INTERVALS = {
+    'live': 5,          # Jogo em andamento
+    'imminent': 30,     # Começa em até 15 minutos (ou já deveria ter começado)
+    'soon': 120,        # Começa em até 1 hora
+    'today': 600,       # Começa em até 6 horas
+    'idle': 1800,       # Encerrado, distante ou sem horário
+}
+
+
+def match_key(match: Dict) -> str:
+    """Identificador estável de um jogo"""
+    return f"{match.get('league')}|{match.get('home_team')}|{match.get('away_team')}"
+
+
+def parse_kickoff(value: Optional[str]) -> Optional[datetime]:
+    """Converte o início do jogo em ISO 8601 (ex: utcDate do provedor) para datetime com fuso"""
+    try:
+        kickoff = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    return kickoff if kickoff.tzinfo else kickoff.replace(tzinfo=timezone.utc)
+
+
+def refresh_interval(match: Dict, now: Optional[datetime] = None,
+                     intervals: Dict[str, float] = DEFAULT_INTERVALS) -> float:
+    """
+    Calcula de quanto em quanto tempo um jogo deve ser atualizado
+
+    Args:
+        match: Jogo com 'status' e o início em 'kickoff' (ISO 8601, UTC) ou,
+            na falta dele, em 'time' (HH:MM, horário local)
+        now: Momento atual (padrão: agora); sem fuso é tratado como horário local
+        intervals: Intervalos por situação
+
+    Returns:
+        Intervalo em segundos
+    """
+    status = (match.get('status') or 'scheduled').lower()
+    if status in LIVE_STATUSES:
+        return intervals['live']
+    if status in FINISHED_STATUSES:
+        return intervals['idle']
+
+    now = (now or datetime.now()).astimezone()
+    kickoff = parse_kickoff(match.get('kickoff'))
+    if kickoff is None:
+        try:
+            hour, minute = (int(part) for part in match['time'].split(':'))
+            kickoff = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except (KeyError, AttributeError, ValueError):
+            return intervals['idle']
+
+    minutes_to_kickoff = (kickoff - now).total_seconds() / 60
+    if minutes_to_kickoff <= 15:
+        return intervals['imminent']
+    if minutes_to_kickoff <= 60:
+        return intervals['soon']
+    if minutes_to_kickoff <= 360:
+        return intervals['today']
+    return intervals['idle']
+
+
+class RefreshScheduler:
+    """
+    Agendador de atualizações baseado em heap
+
+    Cada jogo fica no heap com o momento da próxima atualização. Os jogos
+    vencidos são atualizados do mais atrasado para o menos atrasado enquanto
+    houver orçamento (token bucket de requisições por minuto); o restante
+    espera a reposição do orçamento.
+    """
+
+    def __init__(self, refresh: Callable[[Dict], Optional[Dict]], requests_per_minute: float = 30,
+                 interval: Callable[[Dict], float] = refresh_interval,
+                 clock: Callable[[], float] = time.monotonic):
+        self.refresh = refresh
+        self.interval = interval
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, requests_per_minute / 6)  # Rajada de até 10 s de orçamento
+        self._clock = clock
+        self._tokens = self.capacity
+        self._last_refill = clock()
+        self._heap: List = []
+        self._entries: Dict[str, Dict] = {}
+        # Versão da entrada no heap de cada jogo; entradas antigas são descartadas
+        self._versions: Dict[str, int] = {}
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _push(self, key: str, due: float) -> None:
+        self._counter += 1
+        self._versions[key] = self._counter
+        heapq.heappush(self._heap, (due, self._counter, key))
+
+    def sync(self, matches: Iterable[Dict]) -> None:
+        """
+        Sincroniza o agendador com a lista atual de jogos
+
+        Jogos novos são agendados conforme seu intervalo; jogos que saíram da
+        lista deixam de ser atualizados.
+        """
+        now = self._clock()
+        current = {}
+        for match in matches:
+            key = match_key(match)
+            current[key] = match
+            if key not in self._entries:
+                self._push(key, now + self.interval(match))
+        for key in set(self._entries) - set(current):
+            self._versions.pop(key, None)
+        self._entries = current
+
+    def next_due(self) -> Optional[float]:
+        """Momento (no relógio do agendador) da próxima atualização"""
+        while self._heap and self._versions.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def pop_due(self) -> List[Dict]:
+        """
+        Retira os jogos vencidos que cabem no orçamento atual
+
+        Returns:
+            Jogos a atualizar agora, do mais atrasado para o menos atrasado
+        """
+        self._refill()
+        now = self._clock()
+        due = []
+        while self._tokens >= 1:
+            next_due = self.next_due()
+            if next_due is None or next_due > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            self._versions.pop(key, None)
+            self._tokens -= 1
+            due.append(self._entries[key])
+        return due
+
+    def complete(self, match: Dict, updated: Optional[Dict]) -> Dict:
+        """
+        Registra o resultado de uma atualização e reagenda o jogo
+
+        Args:
+            match: Jogo que foi atualizado
+            updated: Dados novos ou None se a atualização falhou
+
+        Returns:
+            Versão atual do jogo
+        """
+        key = match_key(match)
+        current = updated or match
+        if key in self._entries:
+            self._entries[key] = current
+            self._push(key, self._clock() + self.interval(current))
+        return current
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Segundos até haver um jogo vencido e orçamento para atualizá-lo"""
+        next_due = self.next_due()
+        if next_due is None:
+            return None
+        self._refill()
+        wait_due = max(0.0, next_due - self._clock())
+        wait_budget = max(0.0, (1 - self._tokens) / self.rate) if self.rate else float('inf')
+        return max(wait_due, wait_budget)
+
+    async def run(self, source: Callable[[], List[Dict]], on_update: Callable[[Dict], None],
+                  sync_interval: float = 60.0,
+                  run_blocking: Optional[Callable[..., Awaitable]] = None) -> None:
+        """
+        Executa o agendador indefinidamente
+
+        Args:
+            source: Função bloqueante que retorna a lista atual de jogos
+            on_update: Chamada com cada jogo atualizado
+            sync_interval: De quanto em quanto tempo ressincronizar a lista
+            run_blocking: Executa uma função bloqueante fora do event loop
+                (padrão: executor padrão do loop)
+        """
+        if run_blocking is None:
+            loop = asyncio.get_running_loop()
+
+            async def run_blocking(fn, *args):
+                return await loop.run_in_executor(None, fn, *args)
+
+        last_sync = None
+        while True:
+            try:
+                if last_sync is None or self._clock() - last_sync >= sync_interval:
+                    self.sync(await run_blocking(source))
+                    last_sync = self._clock()
+
+                for match in self.pop_due():
+                    # Cada jogo é reagendado mesmo se a sua atualização falhar; senão
+                    # ele (e o resto do lote) sairia do heap para sempre
+                    try:
+                        updated = await run_blocking(self.refresh, match)
+                    except Exception as e:
+                        logger.warning(f"Erro ao atualizar {match_key(match)}: {str(e)}")
+                        updated = None
+                    current = self.complete(match, updated)
+                    try:
+                        on_update(current)
+                    except Exception as e:
+                        logger.error(f"Erro ao aplicar atualização de {match_key(match)}: {str(e)}")
+            except Exception as e:
+                logger.error(f"Erro no agendador de atualizações: {str(e)}")
+
+            wait_time = self.seconds_until_next()
+            if wait_time is None:
+                wait_time = sync_interval
+            until_sync = sync_interval - (self._clock() - last_sync) if last_sync is not None else 0
+            await asyncio.sleep(max(0.5, min(wait_time, until_sync)))
@@ -10,7 +10,13 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import time
-from config import HEADERS, REQUEST_TIMEOUT, MAX_RETRIES
+from config import (
+    HEADERS, REQUEST_TIMEOUT, MAX_RETRIES, DATA_PROVIDERS,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, HEDGE_AFTER_SECONDS,
+    MATCHES_CACHE_TTL, STANDINGS_CACHE_TTL, IO_WORKERS,
+)
+from providers import CircuitBreaker, Provider, ProviderRouter
+from refresh_scheduler import match_key, parse_kickoff
 import json
 
 # Configurar logging
@@ -38,8 +44,28 @@ class FootballScraper:
         self.session.headers.update(HEADERS)
         self.matches_cache = None
         self.cache_time = None
+        # Incrementada a cada mudança nos jogos em cache
+        self.data_version = 0
+        # Classificações em cache por liga: {liga: {'standings': [...], 'cache_time': ...}}
+        self.standings_cache = {}
+        self.router = ProviderRouter(
+            [
+                Provider(
+                    name=cfg['name'],
+                    base_url=cfg['base_url'],
+                    daily_quota=cfg.get('daily_quota'),
+                    headers=cfg.get('headers'),
+                    breaker=CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT),
+                )
+                for cfg in DATA_PROVIDERS
+            ],
+            hedge_after=HEDGE_AFTER_SECONDS,
+            # Cada thread de IO do bot pode ter uma chamada (e seus hedges) em andamento
+            max_workers=max(4, IO_WORKERS * len(DATA_PROVIDERS)),
+        )
         
-    def _make_request(self, url: str, retries: int = MAX_RETRIES, params: Dict = None) -> Optional[Dict]:
+    def _make_request(self, url: str, retries: int = MAX_RETRIES, params: Dict = None,
+                      headers: Dict = None) -> Optional[Dict]:
         """
         Faz uma requisição HTTP com retry automático
         
@@ -47,13 +73,14 @@ class FootballScraper:
             url: URL para fazer a requisição
             retries: Número de tentativas
             params: Parâmetros da query
+            headers: Headers extras (ex: autenticação do provedor)
             
         Returns:
             Resposta JSON ou None se falhar
         """
         for attempt in range(retries):
             try:
-                response = self.session.get(url, timeout=REQUEST_TIMEOUT, params=params)
+                response = self.session.get(url, timeout=REQUEST_TIMEOUT, params=params, headers=headers)
                 response.raise_for_status()
                 logger.info(f"Requisição bem-sucedida para: {url}")
                 return response.json()
@@ -65,25 +92,135 @@ class FootballScraper:
                     logger.error(f"Falha ao fazer requisição para {url} após {retries} tentativas")
                     return None
     
+    def _fetch_from_providers(self, path: str, params: Dict = None) -> Optional[Dict]:
+        """
+        Faz uma requisição através do roteador de provedores
+        
+        Cada provedor recebe uma única tentativa: o failover e o hedge entre
+        provedores substituem o retry com backoff, e o circuit breaker evita
+        esperar timeouts de um provedor que já está fora do ar.
+        
+        Args:
+            path: Caminho relativo à URL base do provedor
+            params: Parâmetros da query
+            
+        Returns:
+            Resposta JSON ou None se nenhum provedor responder
+        """
+        if not self.router.providers:
+            return None
+        
+        return self.router.fetch(
+            lambda provider: self._make_request(
+                f"{provider.base_url}{path}", retries=1, params=params, headers=provider.headers
+            )
+        )
+    
+    def _normalize_match(self, raw: Dict) -> Dict:
+        """
+        Converte um jogo retornado por um provedor para o formato interno
+        
+        Args:
+            raw: Jogo no formato interno ou no formato da football-data.org
+            
+        Returns:
+            Dicionário no formato usado pelo bot
+        """
+        if 'home_team' in raw:
+            return raw
+        
+        score = (raw.get('score') or {}).get('fullTime') or {}
+        # O provedor informa o início em UTC; 'time' é exibido no horário local
+        kickoff = parse_kickoff(raw.get('utcDate'))
+        return {
+            'id': raw.get('id'),
+            'home_team': (raw.get('homeTeam') or {}).get('name'),
+            'away_team': (raw.get('awayTeam') or {}).get('name'),
+            'league': (raw.get('competition') or {}).get('name'),
+            'time': kickoff.astimezone().strftime('%H:%M') if kickoff else None,
+            'kickoff': kickoff.isoformat() if kickoff else None,
+            'status': (raw.get('status') or 'scheduled').lower(),
+            'score': f"{score['home']}-{score['away']}" if score.get('home') is not None else None,
+            'odds': raw.get('odds'),
+        }
+    
+    def get_provider_health(self) -> List[Dict]:
+        """Retorna o estado dos circuit breakers e estatísticas dos provedores"""
+        return self.router.health()
+    
+    def refresh_match(self, match: Dict) -> Optional[Dict]:
+        """
+        Atualiza um único jogo (placar, status e odds) no provedor
+        
+        Args:
+            match: Jogo a atualizar
+            
+        Returns:
+            Jogo atualizado ou None se não houver dados novos
+        """
+        if match.get('id') is None:
+            return None
+        
+        data = self._fetch_from_providers(f"/matches/{match['id']}")
+        if not data:
+            return None
+        return self._normalize_match(data.get('match', data))
+    
+    def update_match(self, match: Dict) -> None:
+        """
+        Substitui um jogo no cache pela versão atualizada
+        
+        Args:
+            match: Jogo atualizado (identificado por liga e times)
+        """
+        if not self.matches_cache:
+            return
+        
+        key = match_key(match)
+        for idx, cached in enumerate(self.matches_cache):
+            if match_key(cached) == key:
+                if cached != match:
+                    self.matches_cache[idx] = match
+                    self.data_version += 1
+                return
+    
+    def cache_expired(self) -> bool:
+        """Indica se a lista de jogos em cache precisa ser buscada novamente"""
+        return self.matches_cache is None or time.time() - self.cache_time >= MATCHES_CACHE_TTL
+    
     def get_today_matches(self) -> List[Dict]:
         """
         Obtém os jogos de hoje com estatísticas básicas
         Usa dados simulados se a API não estiver disponível
         
+        A lista fica em cache por MATCHES_CACHE_TTL segundos; enquanto isso
+        cada jogo é mantido atualizado pelo agendador de atualizações.
+        
         Returns:
             Lista de dicionários com informações dos jogos
         """
+        if not self.cache_expired():
+            return list(self.matches_cache)
+        
         try:
             # Tentar obter dados da API
             today = datetime.now().strftime("%Y-%m-%d")
             
-            # Usar dados simulados para demonstração
-            # Em produção, você pode integrar com uma API real
-            matches = self._get_simulated_matches()
+            data = self._fetch_from_providers('/matches', params={'dateFrom': today, 'dateTo': today})
+            if data and data.get('matches'):
+                matches = [self._normalize_match(raw) for raw in data['matches']]
+            else:
+                # Usar dados simulados para demonstração
+                # Em produção, configure DATA_PROVIDERS em config.py
+                matches = self._get_simulated_matches()
             
             if matches:
                 logger.info(f"Obtidos {len(matches)} jogos para hoje")
-                return matches
+                if matches != self.matches_cache:
+                    self.data_version += 1
+                self.matches_cache = matches
+                self.cache_time = time.time()
+                return list(matches)
             
             logger.warning("Usando dados simulados para demonstração")
             return self._get_simulated_matches()
@@ -295,6 +432,10 @@ class FootballScraper:
         Returns:
             Lista com a classificação ou None
         """
+        cached = self.standings_cache.get(league)
+        if cached and time.time() - cached['cache_time'] < STANDINGS_CACHE_TTL:
+            return cached['standings']
+        
         try:
             # Dados simulados de classificação
             standings = {
@@ -314,11 +455,49 @@ class FootballScraper:
                 ],
             }
             
-            return standings.get(league, [])
+            league_standings = standings.get(league, [])
+            self.standings_cache[league] = {'standings': league_standings, 'cache_time': time.time()}
+            return league_standings
         
         except Exception as e:
             logger.error(f"Erro ao obter classificação: {str(e)}")
             return None
+    
+    def export_state(self) -> Dict:
+        """
+        Exporta o estado em cache para um snapshot
+        
+        Returns:
+            Dicionário serializável com jogos, odds e classificações
+        """
+        return {
+            'saved_at': time.time(),
+            'matches': list(self.matches_cache) if self.matches_cache is not None else None,
+            'cache_time': self.cache_time,
+            'standings': dict(self.standings_cache),
+        }
+    
+    def restore_state(self, state: Dict) -> None:
+        """
+        Restaura o estado de um snapshot
+        
+        Os horários originais de cada cache são mantidos, então apenas as
+        entradas já expiradas serão buscadas novamente.
+        
+        Args:
+            state: Estado gerado por export_state
+        """
+        if state.get('matches') and state.get('cache_time'):
+            self.matches_cache = state['matches']
+            self.cache_time = state['cache_time']
+            self.data_version += 1
+        self.standings_cache.update(state.get('standings') or {})
+        
+        age = time.time() - state.get('saved_at', 0)
+        logger.info(
+            f"Estado restaurado do snapshot ({age:.0f}s atrás): "
+            f"{len(self.matches_cache or [])} jogos, {len(self.standings_cache)} classificações"
+        )
 
 
 # Função auxiliar para teste
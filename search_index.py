@@ -0,0 +1,159 @@
+"""
+Módulo de Busca de Times
+Índice em memória (trie de prefixos + busca fuzzy) sobre times, apelidos
+e ligas dos jogos em cache, usado pelo modo inline do bot
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza um texto para busca: remove acentos, caixa e pontuação
+
+    Args:
+        text: Texto original (ex: "Mengão", "Paris Saint-Germain")
+
+    Returns:
+        Texto normalizado (ex: "mengao", "paris saint germain")
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', ' ', stripped.lower()).strip()
+
+
+class _TrieNode:
+    """Nó da trie; guarda os jogos do termo exato e de toda a subárvore"""
+
+    __slots__ = ('children', 'term_docs', 'prefix_docs')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.term_docs = set()
+        self.prefix_docs = set()
+
+
+class TeamSearchIndex:
+    """
+    Índice de busca sobre os jogos do dia
+
+    Cada jogo é indexado pelos termos dos nomes dos times, apelidos e liga.
+    Uma consulta casa um jogo quando todos os seus termos casam algum termo
+    do jogo por prefixo, tolerando erros de digitação (distância de edição)
+    calculada durante o próprio percurso da trie.
+    """
+
+    def __init__(self, matches: Iterable[Dict], aliases: Optional[Dict[str, List[str]]] = None):
+        self.matches = list(matches)
+        self._root = _TrieNode()
+        aliases = aliases or {}
+
+        for doc_id, match in enumerate(self.matches):
+            names = []
+            for field in ('home_team', 'away_team', 'league'):
+                name = match.get(field)
+                if name:
+                    names.append(name)
+                    names.extend(aliases.get(name, []))
+            for name in names:
+                for term in normalize_text(name).split():
+                    self._insert(term, doc_id)
+
+    def _insert(self, term: str, doc_id: int) -> None:
+        node = self._root
+        node.prefix_docs.add(doc_id)
+        for char in term:
+            node = node.children.setdefault(char, _TrieNode())
+            node.prefix_docs.add(doc_id)
+        node.term_docs.add(doc_id)
+
+    @staticmethod
+    def _max_distance(token: str) -> int:
+        """Erros tolerados conforme o tamanho do termo digitado"""
+        if len(token) <= 3:
+            return 0
+        if len(token) <= 6:
+            return 1
+        return 2
+
+    def _match_token(self, token: str) -> Dict[int, Tuple[int, bool]]:
+        """
+        Encontra os jogos que casam um termo da consulta
+
+        Percorre a trie calculando a linha da distância de edição (Levenshtein
+        com transposições) entre o termo e o prefixo de cada nó, podando ramos
+        cuja distância mínima já excede o limite. Um nó cuja distância final
+        cabe no limite casa, por prefixo, todos os jogos da sua subárvore.
+
+        Args:
+            token: Termo normalizado da consulta
+
+        Returns:
+            Mapa doc_id -> (menor distância, se casou um termo inteiro)
+        """
+        max_dist = self._max_distance(token)
+        results: Dict[int, Tuple[int, bool]] = {}
+
+        def collect(docs, distance: int, whole: bool) -> None:
+            for doc_id in docs:
+                best = results.get(doc_id)
+                if best is None or (distance, not whole) < (best[0], not best[1]):
+                    results[doc_id] = (distance, whole)
+
+        first_row = list(range(len(token) + 1))
+        stack = [(child, char, first_row, None, '') for char, child in self._root.children.items()]
+        while stack:
+            node, char, previous, before_previous, previous_char = stack.pop()
+            row = [previous[0] + 1]
+            for i, token_char in enumerate(token, 1):
+                cost = 0 if token_char == char else 1
+                row.append(min(row[i - 1] + 1, previous[i] + 1, previous[i - 1] + cost))
+                # Transposição de letras adjacentes conta como um único erro
+                if (before_previous is not None and i > 1
+                        and token_char == previous_char and token[i - 2] == char):
+                    row[i] = min(row[i], before_previous[i - 2] + 1)
+
+            if row[-1] <= max_dist:
+                collect(node.term_docs, row[-1], True)
+                collect(node.prefix_docs, row[-1], False)
+            if min(row) <= max_dist:
+                stack.extend(
+                    (child, next_char, row, previous, char)
+                    for next_char, child in node.children.items()
+                )
+
+        return results
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Busca jogos por time, apelido ou liga
+
+        Args:
+            query: Texto digitado pelo usuário (ex: "flamengo", "barca", "premer")
+            limit: Número máximo de resultados
+
+        Returns:
+            Jogos ordenados por relevância
+        """
+        tokens = normalize_text(query).split()
+        if not tokens:
+            return self.matches[:limit]
+
+        scores: Optional[Dict[int, Tuple[int, int]]] = None
+        for token in tokens:
+            matched = self._match_token(token)
+            if scores is None:
+                scores = {doc_id: (dist, -int(whole)) for doc_id, (dist, whole) in matched.items()}
+            else:
+                scores = {
+                    doc_id: (score[0] + matched[doc_id][0], score[1] - int(matched[doc_id][1]))
+                    for doc_id, score in scores.items()
+                    if doc_id in matched
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=lambda doc_id: (scores[doc_id], doc_id))
+        return [self.matches[doc_id] for doc_id in ranked[:limit]]
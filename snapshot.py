@@ -0,0 +1,126 @@
+"""
+Módulo de Snapshots do Estado do Scraper
+Grava e carrega o estado em cache (jogos, odds, classificações) em um
+arquivo binário compacto, versionado e com checksum, para que o bot
+reinicie "aquecido" em vez de começar com o cache vazio
+
+Formato do arquivo:
+    cabeçalho (20 bytes, big-endian)
+        4s  magic "FBSN"
+        H   versão do formato
+        H   flags (bit 0 = payload comprimido com zlib)
+        I   CRC32 do payload
+        Q   tamanho do payload
+    payload: JSON (UTF-8) comprimido com zlib
+"""
+
+import json
+import logging
+import os
+import struct
+import zlib
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'FBSN'
+SNAPSHOT_VERSION = 1
+FLAG_ZLIB = 0x1
+
+_HEADER = struct.Struct('>4sHHIQ')
+
+
+class SnapshotError(Exception):
+    """Erro lançado quando um snapshot está corrompido ou é incompatível"""
+
+
+def encode_snapshot(state: Dict) -> bytes:
+    """
+    Serializa o estado no formato binário do snapshot
+
+    Args:
+        state: Estado serializável em JSON
+
+    Returns:
+        Bytes do snapshot (cabeçalho + payload)
+    """
+    raw = json.dumps(state, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    payload = zlib.compress(raw, 6)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, FLAG_ZLIB,
+                          zlib.crc32(payload), len(payload))
+    return header + payload
+
+
+def decode_snapshot(data: bytes) -> Dict:
+    """
+    Valida e desserializa um snapshot
+
+    Args:
+        data: Bytes do arquivo
+
+    Returns:
+        Estado gravado
+
+    Raises:
+        SnapshotError: Se o magic, a versão, o tamanho ou o checksum não conferem
+    """
+    if len(data) < _HEADER.size:
+        raise SnapshotError("arquivo truncado")
+
+    magic, version, flags, checksum, length = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("não é um snapshot do bot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"versão {version} incompatível (esperada {SNAPSHOT_VERSION})")
+
+    payload = data[_HEADER.size:_HEADER.size + length]
+    if len(payload) != length:
+        raise SnapshotError("payload truncado")
+    if zlib.crc32(payload) != checksum:
+        raise SnapshotError("checksum inválido")
+
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload.decode('utf-8'))
+
+
+def save_snapshot(path: str, state: Dict) -> int:
+    """
+    Grava um snapshot de forma atômica (arquivo temporário + rename)
+
+    Args:
+        path: Caminho do snapshot
+        state: Estado serializável em JSON
+
+    Returns:
+        Tamanho do arquivo em bytes
+    """
+    data = encode_snapshot(state)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def load_snapshot(path: str) -> Optional[Dict]:
+    """
+    Carrega um snapshot, ignorando arquivos ausentes, corrompidos ou antigos
+
+    Args:
+        path: Caminho do snapshot
+
+    Returns:
+        Estado gravado ou None
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        return decode_snapshot(data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, zlib.error, SnapshotError) as e:
+        logger.warning(f"Snapshot {path} ignorado: {str(e)}")
+        return None
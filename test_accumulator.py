@@ -0,0 +1,106 @@
+"""
+Script de teste para a montagem de múltiplas
+Compara a busca com a enumeração completa e verifica as restrições
+"""
+
+import itertools
+import math
+import random
+from accumulator import build_accumulator, build_selections
+from scraper import FootballScraper
+
+
+def _random_predictions(count, seed):
+    rng = random.Random(seed)
+    predictions = []
+    for i in range(count):
+        odds = {'home': rng.uniform(1.2, 6.0), 'draw': rng.uniform(2.8, 4.5), 'away': rng.uniform(1.2, 8.0)}
+        probability = {'home_win': rng.uniform(10, 70), 'draw': rng.uniform(15, 35), 'away_win': rng.uniform(10, 60)}
+        predictions.append({
+            'home_team': f"Casa {i}", 'away_team': f"Fora {i}",
+            'league': 'LaLiga' if i % 2 else 'Serie A',
+            'odds': odds, 'probability': probability,
+        })
+    return predictions
+
+
+def _brute_force(selections, legs, min_odds, objective):
+    best = None
+    for combo in itertools.combinations(selections, legs):
+        if len({id(s.match) for s in combo}) < legs:
+            continue
+        odds = math.prod(s.odd for s in combo)
+        if odds < min_odds:
+            continue
+        value = math.prod(s.probability for s in combo) * (odds if objective == 'ev' else 1)
+        best = value if best is None else max(best, value)
+    return best
+
+
+def test_accumulator_matches_brute_force():
+    """Testa que a busca exata encontra o ótimo da enumeração completa, mesmo com um beam ruim"""
+    for seed in range(40):
+        selections = build_selections(_random_predictions(10, seed))
+        legs = 1 + seed % 4
+        min_odds = (1.0, 4.0, 15.0, 80.0, 300.0)[seed % 5]
+        objective = ('prob', 'ev')[seed % 2]
+        expected = _brute_force(selections, legs, min_odds, objective)
+
+        # beam_width=1 deixa o beam guloso; o branch-and-bound precisa corrigir
+        for beam_width in (1, 64):
+            result = build_accumulator(
+                selections, legs, min_odds=min_odds, objective=objective, beam_width=beam_width,
+            )
+            if expected is None:
+                assert result is None
+                continue
+            picks = result['selections']
+            assert result['exact']
+            assert len({id(s.match) for s in picks}) == legs
+            assert math.prod(s.odd for s in picks) >= min_odds
+            value = math.prod(s.probability for s in picks)
+            if objective == 'ev':
+                value *= math.prod(s.odd for s in picks)
+            assert math.isclose(value, expected)
+
+
+def test_accumulator_node_limit_keeps_best_found():
+    """Testa que, sem passos para a busca exata, fica a solução do beam"""
+    selections = build_selections(_random_predictions(40, seed=3))
+    result = build_accumulator(selections, legs=4, min_odds=30.0, node_limit=0)
+
+    assert result is not None and not result['exact']
+    assert result['odds'] >= 30.0
+    exact = build_accumulator(selections, legs=4, min_odds=30.0, node_limit=None)
+    assert exact['exact'] and exact['probability'] >= result['probability']
+
+
+def test_accumulator_respects_leagues_and_scales():
+    """Testa o filtro de ligas e a busca com centenas de jogos"""
+    selections = build_selections(_random_predictions(400, seed=1), leagues=['LaLiga'])
+    assert {s.match['league'] for s in selections} == {'LaLiga'}
+
+    result = build_accumulator(selections, legs=8, min_odds=50.0, objective='ev')
+    assert result is not None
+    assert result['odds'] >= 50.0
+
+
+def test_selections_skip_started_matches():
+    """Testa que jogos ao vivo ou encerrados não viram seleções"""
+    predictions = _random_predictions(3, seed=2)
+    predictions[0]['status'] = 'live'
+    predictions[1]['status'] = 'finished'
+    predictions[2]['status'] = 'scheduled'
+
+    selections = build_selections(predictions)
+    assert selections and {s.match['home_team'] for s in selections} == {'Casa 2'}
+
+
+def test_accumulator_with_today_predictions():
+    """Testa a múltipla com as previsões do scraper"""
+    predictions = FootballScraper().get_match_predictions()
+    result = build_accumulator(build_selections(predictions), legs=3, min_odds=5.0)
+
+    assert result is not None
+    assert len(result['selections']) == 3
+    assert build_accumulator(build_selections(predictions), legs=len(predictions) + 1) is None
@@ -0,0 +1,63 @@
+"""
+Script de teste para o backtesting
+Verifica as métricas e a execução em blocos com pool de processos
+"""
+
+import json
+from backtest import BacktestMetrics, iter_fixture_chunks, match_result, run_backtest
+
+
+def certain_home_engine(match):
+    """Motor de teste que sempre prevê vitória do mandante"""
+    return {'home_win': 100.0, 'draw': 0.0, 'away_win': 0.0}
+
+
+def _write_season(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            match = {
+                'home_team': 'A', 'away_team': 'B', 'league': 'LaLiga',
+                'odds': {'home': 2.10, 'draw': 3.40, 'away': 3.50},
+                'result': result,
+            }
+            f.write(json.dumps(match) + '\n')
+
+
+def test_match_result():
+    """Testa a leitura do resultado por campo ou placar"""
+    assert match_result({'result': 'draw'}) == 'draw'
+    assert match_result({'score': '2-1'}) == 'home'
+    assert match_result({'score': '0-3'}) == 'away'
+    assert match_result({}) is None
+
+
+def test_metrics_perfect_and_wrong_predictions():
+    """Testa Brier score, calibração e ROI"""
+    metrics = BacktestMetrics()
+    odds = {'home': 2.0, 'draw': 3.0, 'away': 4.0}
+    metrics.add({'odds': odds, 'result': 'home'}, certain_home_engine(None))
+    metrics.add({'odds': odds, 'result': 'away'}, certain_home_engine(None))
+
+    summary = metrics.summary()
+    assert summary['matches'] == 2
+    assert summary['brier_score'] == 1.0
+    assert summary['bets'] == 2
+    assert summary['roi'] == 0.0
+    top_bin = summary['calibration'][-1]
+    assert top_bin['predictions'] == 2 and top_bin['observed'] == 0.5
+
+
+def test_run_backtest_in_chunks_with_process_pool(tmp_path):
+    """Testa que o pool de processos produz o mesmo resultado da execução local"""
+    season_a = str(tmp_path / 'a.jsonl')
+    season_b = str(tmp_path / 'b.jsonl')
+    _write_season(season_a, ['home', 'draw', 'away'] * 10)
+    _write_season(season_b, ['home'] * 7)
+
+    assert sum(len(c) for c in iter_fixture_chunks(season_a, chunk_size=4)) == 30
+
+    local = run_backtest([season_a, season_b], engine=certain_home_engine, workers=1, chunk_size=4)
+    pooled = run_backtest([season_a, season_b], engine=certain_home_engine, workers=2, chunk_size=4)
+
+    assert local == pooled
+    assert local['matches'] == 37
@@ -0,0 +1,66 @@
+"""
+Script de teste para as conversas do /analisar
+Verifica o orçamento de tokens, o resumo das trocas antigas e a expiração
+"""
+
+from conversation import ConversationStore, estimate_tokens
+
+
+def _history_tokens(messages):
+    return sum(estimate_tokens(m['content']) for m in messages)
+
+
+def test_history_stays_within_budget(clock):
+    """Testa que trocas antigas viram resumo e o pedido cabe no orçamento"""
+    store = ConversationStore(token_budget=200, summary_tokens=60, clock=clock)
+    store.start(1)
+    for i in range(50):
+        question = f"Pergunta {i} sobre o jogo?"
+        messages, prompt = store.build_messages(1, question)
+        assert prompt == question
+        # Só o cabeçalho do resumo fica fora da conta
+        assert _history_tokens(messages) + estimate_tokens(prompt) <= 200 + 10
+        store.add_turn(1, question, f"Resposta {i}. " + "Detalhes da análise. " * 10)
+
+    messages, _ = store.build_messages(1, "E agora?")
+    assert messages[0]['role'] == 'system'
+    assert 'Resumo' in messages[0]['content']
+    # A troca mais recente continua completa
+    assert messages[-2]['content'] == "Pergunta 49 sobre o jogo?"
+    assert messages[-1]['content'].startswith("Resposta 49.")
+
+
+def test_idle_sessions_are_evicted(clock):
+    """Testa a expiração por inatividade e o limite de sessões"""
+    store = ConversationStore(idle_timeout=100, max_sessions=2, clock=clock)
+    store.start(1)
+    clock.now = 50
+    store.start(2)
+    assert 1 in store and 2 in store
+
+    clock.now = 120
+    assert 1 not in store
+    assert 2 in store
+    assert store.build_messages(1, "oi") == ([], "oi")
+
+    store.start(3)
+    store.start(4)
+    assert len(store) == 2 and 2 not in store
+
+    assert store.end(4) is True
+    assert store.end(4) is False
+
+
+def test_oversized_question_is_truncated_to_budget(clock):
+    """Testa que uma pergunta maior que o orçamento é encurtada"""
+    store = ConversationStore(token_budget=200, summary_tokens=60, clock=clock)
+    store.start(1)
+    store.add_turn(1, "Pergunta inicial?", "Resposta inicial. " * 5)
+
+    question = "Analise este jogo em detalhes. " * 100
+    messages, prompt = store.build_messages(1, question)
+
+    assert prompt != question and prompt.startswith("Analise este jogo")
+    assert _history_tokens(messages) + estimate_tokens(prompt) <= 200
+    # A troca anterior foi para o resumo em vez de ser descartada
+    assert messages[0]['role'] == 'system' and 'Pergunta inicial' in messages[0]['content']
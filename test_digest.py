@@ -0,0 +1,153 @@
+"""
+Script de teste para o resumo diário
+Verifica o agrupamento, a divisão de mensagens e o broadcast retomável
+"""
+
+import asyncio
+from telegram.error import Forbidden, RetryAfter
+from digest import (
+    BroadcastCheckpoint, broadcast, group_subscribers, load_digest_state, render_digest, save_digest_state,
+    split_message,
+)
+
+
+def test_group_subscribers_by_preferences():
+    """Testa o agrupamento por conjunto idêntico de ligas"""
+    preferences = {
+        1: ['LaLiga', 'Serie A'],
+        2: ['Serie A', 'LaLiga'],
+        3: ['Premier League'],
+    }
+    groups = group_subscribers([1, 2, 3, 4], preferences)
+
+    assert sorted(groups[frozenset({'LaLiga', 'Serie A'})]) == [1, 2]
+    assert groups[frozenset({'Premier League'})] == [3]
+    assert groups[frozenset()] == [4]
+
+
+def test_render_digest_filters_leagues():
+    """Testa que o resumo inclui apenas as ligas do grupo"""
+    predictions = [
+        {'home_team': 'A', 'away_team': 'B', 'league': 'LaLiga', 'time': '20:00',
+         'probability': {'home_win': 50.0, 'draw': 30.0, 'away_win': 20.0}},
+        {'home_team': 'C', 'away_team': 'D', 'league': 'Serie A'},
+    ]
+
+    text = render_digest(predictions, frozenset({'LaLiga'}))
+    assert 'A vs B' in text and '50.0%' in text
+    assert 'C vs D' not in text
+    assert 'C vs D' in render_digest(predictions, frozenset())
+
+
+def test_digest_state_keeps_preferences(tmp_path):
+    """Testa que as preferências de ligas sobrevivem a um reinício"""
+    path = str(tmp_path / 'subscribers.json')
+    save_digest_state(path, {3, 1}, {1: ['LaLiga', 'Serie A']})
+    assert load_digest_state(path) == ({1, 3}, {1: ['LaLiga', 'Serie A']})
+
+    # Formato antigo: só a lista de inscritos
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[5, 6]')
+    assert load_digest_state(path) == ({5, 6}, {})
+    assert load_digest_state(str(tmp_path / 'missing.json')) == (set(), {})
+
+
+def test_split_message():
+    """Testa a divisão em partes dentro do limite do Telegram"""
+    text = '\n'.join(f"linha {i}" for i in range(100))
+    chunks = split_message(text, limit=50)
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert '\n'.join(chunks) == text
+
+
+def test_broadcast_resumes_from_checkpoint(tmp_path):
+    """Testa o respeito ao 429, o bloqueio e a retomada pelo checkpoint"""
+    path = str(tmp_path / 'checkpoint.log')
+    sent = []
+    throttled = []
+
+    async def send(chat_id, text):
+        if chat_id == 3 and not throttled:
+            throttled.append(chat_id)
+            raise RetryAfter(0)
+        if chat_id == 4:
+            raise Forbidden("bot was blocked by the user")
+        sent.append(chat_id)
+
+    # Simula uma queda: o chat 1 já havia sido atendido
+    checkpoint = BroadcastCheckpoint(path, key='2026-10-19')
+    checkpoint.mark_done(1)
+    checkpoint.flush()
+
+    deliveries = [(chat_id, ['olá']) for chat_id in range(1, 6)]
+    stats = asyncio.run(broadcast(
+        deliveries, send, checkpoint=BroadcastCheckpoint(path, key='2026-10-19'),
+        rate_per_second=1000, workers=2,
+    ))
+
+    assert sorted(sent) == [2, 3, 5]
+    assert stats['skipped'] == 1
+    assert stats['blocked'] == [4]
+
+    resumed = BroadcastCheckpoint(path, key='2026-10-19')
+    assert resumed.completed
+    assert resumed.done == {1, 2, 3, 4, 5}
+    assert not BroadcastCheckpoint(path, key='2026-10-20').started
+
+
+def test_broadcast_resumes_after_hard_kill_before_first_flush(tmp_path):
+    """Testa a retomada quando o processo morre antes de gravar o primeiro lote"""
+    path = str(tmp_path / 'checkpoint.log')
+    deliveries = [(chat_id, ['olá']) for chat_id in range(1, 11)]
+    sent = []
+    running = []
+
+    async def send_until_killed(chat_id, text):
+        if len(sent) == 3:
+            running[0].cancel()
+            await asyncio.sleep(1)
+        sent.append(chat_id)
+
+    async def killed_broadcast():
+        # Uma queda brusca não executa nenhuma gravação pendente
+        checkpoint = BroadcastCheckpoint(path, key='2026-10-19', flush_every=100, flush_interval=3600)
+        checkpoint.flush = checkpoint.complete = lambda: None
+        running.append(asyncio.create_task(broadcast(
+            deliveries, send_until_killed, checkpoint=checkpoint, rate_per_second=1000, workers=1,
+        )))
+        try:
+            await running[0]
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(killed_broadcast())
+    assert sent == [1, 2, 3]
+
+    resumed = BroadcastCheckpoint(path, key='2026-10-19')
+    assert resumed.started and not resumed.completed
+
+    async def send(chat_id, text):
+        sent.append(chat_id)
+
+    asyncio.run(broadcast(deliveries, send, checkpoint=resumed, rate_per_second=1000, workers=2))
+    # Sem nenhum lote gravado, a retomada reenvia o que já saiu, mas ninguém fica sem resumo
+    assert set(sent) == set(range(1, 11))
+    assert BroadcastCheckpoint(path, key='2026-10-19').completed
+
+
+def test_checkpoint_flushes_small_batches(tmp_path):
+    """Testa a gravação por contagem e por tempo"""
+    path = str(tmp_path / 'checkpoint.log')
+    now = [0.0]
+    checkpoint = BroadcastCheckpoint(path, key='k', flush_every=3, flush_interval=1.0, clock=lambda: now[0])
+    checkpoint.begin()
+    checkpoint.mark_done(1)
+    checkpoint.mark_done(2)
+    assert BroadcastCheckpoint(path, key='k').done == set()
+    checkpoint.mark_done(3)
+    assert BroadcastCheckpoint(path, key='k').done == {1, 2, 3}
+
+    now[0] = 1.5
+    checkpoint.mark_done(4)
+    assert BroadcastCheckpoint(path, key='k').done == {1, 2, 3, 4}
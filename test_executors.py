@@ -0,0 +1,80 @@
+"""
+Script de teste para as camadas de execução
+Verifica a execução em threads e processos e as métricas de fila
+"""
+
+import asyncio
+import time
+import pytest
+from executors import CPU, IO, TieredExecutor
+
+
+def _square_sum(n):
+    return sum(i * i for i in range(n))
+
+
+def _slow_square_sum(n):
+    time.sleep(0.01)
+    return _square_sum(n)
+
+
+def _fail():
+    raise RuntimeError("falha")
+
+
+def test_io_and_cpu_tiers_run_functions():
+    """Testa a execução nas duas camadas e a contagem das métricas"""
+    async def scenario(executor):
+        results = await asyncio.gather(*(executor.run_io(_slow_square_sum, n) for n in range(10)))
+        cpu_result = await executor.run_cpu(_square_sum, 100)
+        with pytest.raises(RuntimeError):
+            await executor.run_io(_fail)
+        return results, cpu_result
+
+    executor = TieredExecutor(io_workers=2, cpu_workers=1, io_queue_limit=1, cpu_queue_limit=1)
+    try:
+        results, cpu_result = asyncio.run(scenario(executor))
+    finally:
+        executor.shutdown(wait=True)
+
+    assert results == [_square_sum(n) for n in range(10)]
+    assert cpu_result == _square_sum(100)
+
+    metrics = executor.metrics()
+    assert metrics[IO]['completed'] == 10 and metrics[IO]['failed'] == 1
+    assert metrics[IO]['in_flight'] == 0 and metrics[IO]['waiting'] == 0
+    # Fila limitada: 10 tarefas simultâneas, mas só 3 vagas (2 threads + 1 na fila)
+    assert metrics[IO]['max_depth'] == 10
+    assert metrics[IO]['max_in_flight'] == 3
+    assert metrics[CPU]['completed'] == 1
+
+
+def test_invalid_tier_is_rejected():
+    """Testa que uma camada desconhecida gera erro"""
+    executor = TieredExecutor()
+    with pytest.raises(ValueError):
+        asyncio.run(executor.run('gpu', _square_sum, 3))
+
+
+def test_cancelled_waiting_task_leaves_queue_metrics():
+    """Testa que uma tarefa cancelada na fila não fica contada como aguardando"""
+    async def scenario(executor):
+        running = asyncio.ensure_future(executor.run_io(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run_io(time.sleep, 0))
+        await asyncio.sleep(0.05)
+        assert executor.metrics()[IO]['waiting'] == 1
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        await running
+
+    executor = TieredExecutor(io_workers=1, io_queue_limit=0)
+    try:
+        asyncio.run(scenario(executor))
+    finally:
+        executor.shutdown(wait=True)
+
+    metrics = executor.metrics()
+    assert metrics[IO]['waiting'] == 0 and metrics[IO]['in_flight'] == 0
+    assert metrics[IO]['completed'] == 1
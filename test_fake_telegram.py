@@ -0,0 +1,43 @@
+"""
+Script de teste para a Bot API simulada
+Verifica o long polling de updates e as respostas 429
+"""
+
+import json
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+from fake_telegram import FakeTelegramServer, FakeTelegramState, make_message_update
+
+
+def _call(server, method, **params):
+    url = f"{server.base_url}TOKEN/{method}"
+    try:
+        with urlopen(url, data=urlencode(params).encode('utf-8'), timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_get_updates_and_rate_limit():
+    """Testa a entrega de updates e o 429 ao exceder o limite por chat"""
+    server = FakeTelegramServer(state=FakeTelegramState(chat_rate=0.5, chat_burst=2)).start()
+    try:
+        update_id = server.state.push_update(make_message_update(42, '/jogos', 1))
+
+        status, body = _call(server, 'getUpdates', offset=0, timeout=1)
+        assert status == 200
+        assert body['result'][0]['message']['text'] == '/jogos'
+
+        status, body = _call(server, 'getUpdates', offset=update_id + 1, timeout=0)
+        assert body['result'] == []
+
+        statuses = [_call(server, 'sendMessage', chat_id=42, text='oi')[0] for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+        status, body = _call(server, 'sendMessage', chat_id=42, text='oi')
+        assert body['error_code'] == 429
+        assert body['parameters']['retry_after'] >= 1
+        assert server.state.stats['throttled'] == 2
+    finally:
+        server.stop()
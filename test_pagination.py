@@ -0,0 +1,90 @@
+"""
+Script de teste para a paginação do /jogos
+Verifica as páginas, o callback_data e o cache LRU
+"""
+
+from pagination import (
+    FILTER_ALL, FILTER_PREFERENCES, LRUCache, decode_callback, encode_callback, navigation_buttons,
+    render_page, sort_matches,
+)
+
+
+def _matches(count):
+    return [
+        {'home_team': f"Casa {i:04d}", 'away_team': f"Fora {i:04d}",
+         'league': ('LaLiga', 'Serie A')[i % 2], 'time': f"{10 + i % 10}:00"}
+        for i in range(count)
+    ]
+
+
+def test_render_pages_cover_every_match():
+    """Testa que a paginação mostra todos os jogos exatamente uma vez"""
+    matches = sort_matches(_matches(1000))
+    seen = 0
+    page, total_pages = 0, None
+    while total_pages is None or page < total_pages:
+        text, rendered, total_pages = render_page(matches, page, page_size=10)
+        assert rendered == page
+        seen += text.count(' vs ')
+        page += 1
+
+    assert total_pages == 100
+    assert seen == 1000
+    # Páginas fora do intervalo são ajustadas
+    assert render_page(matches, 500, page_size=10)[1] == 99
+    assert render_page([], 3, page_size=10)[1:] == (0, 1)
+
+
+def test_sort_matches_filters_leagues():
+    """Testa o filtro por ligas preferidas"""
+    selected = sort_matches(_matches(10), leagues=('LaLiga',))
+    assert len(selected) == 5
+    assert {m['league'] for m in selected} == {'LaLiga'}
+
+
+def test_callback_data_is_small_and_stateless():
+    """Testa a codificação dos botões de navegação"""
+    data = encode_callback(FILTER_ALL, 99)
+    assert len(data.encode('utf-8')) <= 64
+    assert decode_callback(data) == (FILTER_ALL, 99)
+    assert decode_callback('liga_premier') is None
+    assert decode_callback('jg|x|1') is None
+
+    buttons = navigation_buttons(FILTER_ALL, 0, 3)
+    assert [label for label, _ in buttons] == ['1/3', '▶️']
+    assert navigation_buttons(FILTER_ALL, 0, 1) == []
+
+
+def test_lru_cache_evicts_oldest():
+    """Testa a remoção da entrada menos usada"""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_page_cache_keeps_filters_apart():
+    """Testa que /jogos e /jogos minhas (sem preferências) não dividem o cache"""
+    from bot import FootballBotHandler
+
+    class FakeScraper:
+        data_version = 1
+
+        def get_today_matches(self):
+            return _matches(30)
+
+    handler = FootballBotHandler.__new__(FootballBotHandler)
+    handler.scraper = FakeScraper()
+    handler.jogos_page_cache = LRUCache()
+    handler.jogos_list_cache = LRUCache()
+
+    def callbacks(filter_code):
+        _, markup, _ = handler._render_jogos_page(filter_code, (), 0)
+        return [button.callback_data for button in markup.inline_keyboard[0]]
+
+    assert callbacks(FILTER_PREFERENCES) == ['jg|p|0', 'jg|p|1']
+    assert callbacks(FILTER_ALL) == ['jg|a|0', 'jg|a|1']
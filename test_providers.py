@@ -0,0 +1,143 @@
+"""
+Script de teste para o roteamento entre provedores
+Verifica o circuit breaker, o hedge e o roteamento por cota
+"""
+
+import time
+import pytest
+from providers import CircuitBreaker, CircuitOpenError, Provider, ProviderRouter
+
+
+def test_circuit_breaker_states(clock):
+    """Testa as transições closed -> open -> half_open -> closed"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    # Apenas uma requisição de teste por vez no estado half_open
+    assert not breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_router_fails_over_and_skips_open_circuit():
+    """Testa o failover para o próximo provedor e o bloqueio do circuito aberto"""
+    dead = Provider('dead', 'http://dead', breaker=CircuitBreaker(failure_threshold=1))
+    alive = Provider('alive', 'http://alive')
+    router = ProviderRouter([dead, alive])
+    calls = []
+
+    def fetch(provider):
+        calls.append(provider.name)
+        return None if provider.name == 'dead' else {'matches': []}
+
+    assert router.fetch(fetch) == {'matches': []}
+    assert dead.breaker.state == CircuitBreaker.OPEN
+
+    calls.clear()
+    assert router.fetch(fetch) == {'matches': []}
+    assert calls == ['alive']
+
+
+def test_router_prefers_provider_with_quota():
+    """Testa o roteamento para o provedor com mais cota restante"""
+    scarce = Provider('scarce', 'http://scarce', daily_quota=2)
+    plenty = Provider('plenty', 'http://plenty', daily_quota=100)
+    router = ProviderRouter([scarce, plenty])
+
+    scarce.consume_quota()
+    assert [p.name for p in router.ranked_providers()] == ['plenty', 'scarce']
+
+    scarce.consume_quota()
+    assert [p.name for p in router.ranked_providers()] == ['plenty']
+
+
+def test_router_hedges_slow_provider():
+    """Testa o disparo do hedge quando o primário excede o atraso configurado"""
+    slow = Provider('slow', 'http://slow', daily_quota=100)
+    fast = Provider('fast', 'http://fast', daily_quota=50)
+    router = ProviderRouter([slow, fast], hedge_after=0.05)
+
+    def fetch(provider):
+        if provider.name == 'slow':
+            time.sleep(0.5)
+        return {'provider': provider.name}
+
+    start = time.monotonic()
+    assert router.fetch(fetch) == {'provider': 'fast'}
+    assert time.monotonic() - start < 0.4
+
+
+def test_hedge_delay_ignores_time_queued_in_pool():
+    """Testa que uma espera curta no pool não dispara hedges"""
+    primary = Provider('primary', 'http://primary', daily_quota=100)
+    backup = Provider('backup', 'http://backup', daily_quota=50)
+    router = ProviderRouter([primary, backup], hedge_after=0.1, max_workers=1)
+    calls = []
+
+    def fetch(provider):
+        calls.append(provider.name)
+        time.sleep(0.05)
+        return {'provider': provider.name}
+
+    # A chamada fica 0,08 s na fila e leva 0,05 s: passa de 0,1 s desde o envio, mas não desde o início
+    router._executor.submit(time.sleep, 0.08)
+    assert router.fetch(fetch) == {'provider': 'primary'}
+    time.sleep(0.1)
+    assert calls == ['primary']
+
+
+def test_hedge_fires_when_call_never_leaves_pool_queue():
+    """Testa que um pool saturado não atrasa o hedge indefinidamente"""
+    primary = Provider('primary', 'http://primary', daily_quota=100)
+    backup = Provider('backup', 'http://backup', daily_quota=50)
+    router = ProviderRouter([primary, backup], hedge_after=0.05, max_workers=1)
+    calls = []
+
+    def fetch(provider):
+        calls.append(provider.name)
+        return {'provider': provider.name}
+
+    # Um provedor degradado ocupa o pool principal
+    router._executor.submit(time.sleep, 0.5)
+    start = time.monotonic()
+    assert router.fetch(fetch) == {'provider': 'backup'}
+    assert time.monotonic() - start < 0.3
+
+    # A chamada primária ainda na fila foi cancelada
+    time.sleep(0.6)
+    assert calls == ['backup']
+
+
+def test_quota_refusal_releases_half_open_probe(clock):
+    """Testa que a falta de cota não prende a requisição de teste do half_open"""
+    provider = Provider('only', 'http://only', daily_quota=1,
+                        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock))
+    router = ProviderRouter([provider])
+    provider.breaker.record_failure()
+    provider.consume_quota()
+
+    clock.now = 10
+    # Cota esgotada entre o ranking e a chamada
+    with pytest.raises(CircuitOpenError):
+        router._call(provider, lambda p: {'ok': True})
+    assert provider.breaker.state == CircuitBreaker.HALF_OPEN
+
+    # Com a cota de volta, o teste do half_open é liberado e fecha o circuito
+    provider._used_today = 0
+    assert router.fetch(lambda p: {'ok': True}) == {'ok': True}
+    assert provider.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,127 @@
+"""
+Script de teste para o agendador de atualizações
+Verifica os intervalos por status/horário e o orçamento de requisições
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from refresh_scheduler import DEFAULT_INTERVALS, RefreshScheduler, match_key, refresh_interval
+
+
+def _match(home, status='scheduled', time='15:00'):
+    return {'home_team': home, 'away_team': 'X', 'league': 'L', 'status': status, 'time': time}
+
+
+def test_refresh_interval_by_status_and_kickoff():
+    """Testa os intervalos conforme status e proximidade do início"""
+    now = datetime(2026, 10, 19, 14, 0)
+
+    assert refresh_interval(_match('A', status='live'), now) == DEFAULT_INTERVALS['live']
+    assert refresh_interval(_match('A', status='finished'), now) == DEFAULT_INTERVALS['idle']
+    assert refresh_interval(_match('A', time='14:10'), now) == DEFAULT_INTERVALS['imminent']
+    assert refresh_interval(_match('A', time='14:45'), now) == DEFAULT_INTERVALS['soon']
+    assert refresh_interval(_match('A', time='18:00'), now) == DEFAULT_INTERVALS['today']
+    assert refresh_interval(_match('A', time='23:30'), now) == DEFAULT_INTERVALS['idle']
+    assert refresh_interval(_match('A', time=None), now) == DEFAULT_INTERVALS['idle']
+
+
+def test_refresh_interval_uses_utc_kickoff(monkeypatch):
+    """Testa que o utcDate do provedor é comparado em UTC, não como horário local"""
+    from scraper import FootballScraper
+
+    # Implantação em UTC-3
+    monkeypatch.setenv('TZ', 'Etc/GMT+3')
+    time.tzset()
+    try:
+        match = FootballScraper()._normalize_match({
+            'id': 1, 'homeTeam': {'name': 'A'}, 'awayTeam': {'name': 'B'},
+            'competition': {'name': 'L'}, 'status': 'SCHEDULED', 'utcDate': '2026-10-19T18:00:00Z',
+        })
+        assert match['time'] == '15:00'
+
+        now = datetime(2026, 10, 19, 17, 50, tzinfo=timezone.utc)
+        assert refresh_interval(match, now) == DEFAULT_INTERVALS['imminent']
+        # Horário local sem fuso: 14:50 em UTC-3 também está a 10 minutos do início
+        assert refresh_interval(match, datetime(2026, 10, 19, 14, 50)) == DEFAULT_INTERVALS['imminent']
+        assert refresh_interval(match, datetime(2026, 10, 19, 11, 0)) == DEFAULT_INTERVALS['today']
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_scheduler_orders_by_due_time_within_budget(clock):
+    """Testa a ordem do heap e o limite de requisições por minuto"""
+    intervals = {'live': 5, 'idle': 100}
+    scheduler = RefreshScheduler(
+        refresh=lambda match: None,
+        requests_per_minute=6,  # 1 requisição a cada 10 s, rajada de 1
+        interval=lambda match: intervals[match['status']],
+        clock=clock,
+    )
+    live = _match('Live', status='live')
+    idle = _match('Idle', status='idle')
+    scheduler.sync([idle, live])
+
+    assert scheduler.pop_due() == []
+
+    clock.now = 5
+    assert scheduler.pop_due() == [live]
+    scheduler.complete(live, dict(live, score='1-0'))
+
+    # Vencido de novo em t=10, mas o orçamento só repõe em t=15
+    clock.now = 10
+    assert scheduler.pop_due() == []
+    assert scheduler.seconds_until_next() == 5
+
+    clock.now = 15
+    due = scheduler.pop_due()
+    assert [match_key(m) for m in due] == [match_key(live)]
+    assert due[0]['score'] == '1-0'
+
+
+def test_scheduler_drops_removed_matches(clock):
+    """Testa que jogos fora da lista deixam de ser atualizados"""
+    scheduler = RefreshScheduler(refresh=lambda match: None, interval=lambda match: 1, clock=clock)
+    scheduler.sync([_match('A'), _match('B')])
+    scheduler.sync([_match('B')])
+
+    clock.now = 2
+    assert [m['home_team'] for m in scheduler.pop_due()] == ['B']
+    assert len(scheduler) == 1
+
+
+def test_failed_refresh_keeps_batch_scheduled(clock):
+    """Testa que uma falha na atualização de um jogo não tira o lote do agendador"""
+    refreshed = []
+    updates = []
+
+    def refresh(match):
+        if match['home_team'] == 'A':
+            raise ValueError("provedor fora do ar")
+        refreshed.append(match['home_team'])
+        return dict(match, score='1-0')
+
+    scheduler = RefreshScheduler(refresh=refresh, requests_per_minute=600, interval=lambda match: 1, clock=clock)
+    scheduler.sync([_match('A'), _match('B'), _match('C')])
+    clock.now = 2
+
+    async def run_blocking(fn, *args):
+        return fn(*args)
+
+    async def run_once():
+        try:
+            await asyncio.wait_for(scheduler.run(
+                source=lambda: [_match('A'), _match('B'), _match('C')], on_update=updates.append,
+                sync_interval=3600, run_blocking=run_blocking,
+            ), timeout=0.2)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(run_once())
+    assert sorted(refreshed) == ['B', 'C']
+    assert len(updates) == 3
+
+    # Os três continuam agendados, inclusive o que falhou
+    clock.now = 10
+    assert sorted(m['home_team'] for m in scheduler.pop_due()) == ['A', 'B', 'C']
@@ -0,0 +1,117 @@
+"""
+Script de teste para o índice de busca do modo inline
+Verifica a busca por prefixo, apelidos, acentos e erros de digitação
+"""
+
+import time
+from scraper import FootballScraper
+from search_index import TeamSearchIndex, normalize_text
+from config import TEAM_ALIASES
+
+
+def _build_index():
+    matches = FootballScraper()._get_simulated_matches()
+    return TeamSearchIndex(matches, aliases=TEAM_ALIASES)
+
+
+def _teams(results):
+    return [(m['home_team'], m['away_team']) for m in results]
+
+
+def test_normalize_text():
+    """Testa a remoção de acentos e pontuação"""
+    assert normalize_text("Mengão") == "mengao"
+    assert normalize_text("Paris Saint-Germain") == "paris saint germain"
+
+
+def test_prefix_and_alias_search():
+    """Testa a busca por prefixo, apelido e liga"""
+    index = _build_index()
+
+    assert _teams(index.search("flam")) == [('Flamengo', 'Palmeiras')]
+    assert _teams(index.search("mengão")) == [('Flamengo', 'Palmeiras')]
+    assert _teams(index.search("barça")) == [('Real Madrid', 'Barcelona')]
+    assert _teams(index.search("brasileirao")) == [('Flamengo', 'Palmeiras')]
+    assert len(index.search("")) == len(index.matches)
+
+
+def test_fuzzy_search():
+    """Testa a tolerância a erros de digitação"""
+    index = _build_index()
+
+    assert _teams(index.search("flamego")) == [('Flamengo', 'Palmeiras')]
+    assert _teams(index.search("dortmund bayren")) == [('Bayern Munich', 'Borussia Dortmund')]
+    assert index.search("xyzxyz") == []
+
+
+def test_exact_term_ranks_first():
+    """Testa que um termo exato vem antes de um prefixo"""
+    index = _build_index()
+
+    results = index.search("milan")
+    assert {m['home_team'] for m in results} == {'AC Milan'}
+    assert index.search("inter")[0]['away_team'] == 'Inter Milan'
+
+
+def test_search_latency_with_many_fixtures():
+    """Testa que a busca fica abaixo de 100 ms com milhares de jogos"""
+    base = FootballScraper()._get_simulated_matches()
+    matches = []
+    for i in range(500):
+        for match in base:
+            matches.append(dict(match, home_team=f"{match['home_team']} {i}"))
+    index = TeamSearchIndex(matches, aliases=TEAM_ALIASES)
+
+    start = time.perf_counter()
+    results = index.search("barcelnoa", limit=20)
+    assert time.perf_counter() - start < 0.1
+    assert len(results) == 20
+
+
+def test_bot_rebuilds_index_only_when_fixtures_change():
+    """Testa que mudanças de placar não reconstroem o índice do modo inline"""
+    import asyncio
+    from bot import FootballBotHandler
+    from executors import TieredExecutor
+
+    class FakeScraper:
+        data_version = 1
+        matches = [dict(m) for m in FootballScraper()._get_simulated_matches()]
+
+        def cache_expired(self):
+            return False
+
+        def get_today_matches(self):
+            return self.matches
+
+        def get_match_predictions(self):
+            return [dict(m, probability={}) for m in self.matches]
+
+    handler = FootballBotHandler.__new__(FootballBotHandler)
+    handler.scraper = FakeScraper()
+    handler.executor = TieredExecutor(io_workers=1)
+    handler.search_index = handler.search_index_version = handler.search_index_fixtures = None
+    handler.search_latest_matches = {}
+
+    async def scenario():
+        handler.search_index_lock = asyncio.Lock()
+        first = await handler._get_search_index()
+
+        # Placar ao vivo: nova versão, mesmos jogos
+        handler.scraper.matches[0] = dict(handler.scraper.matches[0], score='2-1')
+        handler.scraper.data_version = 2
+        assert await handler._get_search_index() is first
+        latest = handler.search_latest_matches.values()
+        assert any(m.get('score') == '2-1' for m in latest)
+
+        # Jogo novo: o índice é reconstruído
+        handler.scraper.matches.append({'home_team': 'Novo FC', 'away_team': 'Outro FC', 'league': 'L'})
+        handler.scraper.data_version = 3
+        rebuilt = await handler._get_search_index()
+        assert rebuilt is not first
+        assert _teams(rebuilt.search('novo')) == [('Novo FC', 'Outro FC')]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        handler.executor.shutdown(wait=True)
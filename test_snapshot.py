@@ -0,0 +1,56 @@
+"""
+Script de teste para os snapshots do estado do scraper
+Verifica o formato binário, o checksum e o reinício "aquecido"
+"""
+
+import time
+from scraper import FootballScraper
+from snapshot import SnapshotError, decode_snapshot, encode_snapshot, load_snapshot, save_snapshot
+
+
+def test_snapshot_roundtrip_and_corruption():
+    """Testa a leitura do snapshot e a rejeição de arquivos corrompidos"""
+    state = {'matches': [{'home_team': 'Flamengo', 'away_team': 'Palmeiras'}], 'cache_time': 1.5}
+    data = encode_snapshot(state)
+    assert decode_snapshot(data) == state
+
+    corrupted = bytearray(data)
+    corrupted[-1] ^= 0xFF
+    for bad in (bytes(corrupted), data[:10], b'XXXX' + data[4:]):
+        try:
+            decode_snapshot(bad)
+        except SnapshotError:
+            pass
+        else:
+            raise AssertionError("snapshot inválido aceito")
+
+
+def test_warm_start_keeps_fresh_entries(tmp_path):
+    """Testa que o estado restaurado é usado sem nova busca enquanto não expira"""
+    path = str(tmp_path / 'state.snap')
+    scraper = FootballScraper()
+    matches = scraper.get_today_matches()
+    scraper.get_league_standings('LaLiga')
+    save_snapshot(path, scraper.export_state())
+
+    restored = FootballScraper()
+    restored._get_simulated_matches = lambda: []  # Falharia se buscasse de novo
+    restored.restore_state(load_snapshot(path))
+
+    assert restored.get_today_matches() == matches
+    assert restored.get_league_standings('LaLiga') == scraper.get_league_standings('LaLiga')
+
+
+def test_stale_snapshot_entries_are_refreshed(tmp_path):
+    """Testa que entradas expiradas são buscadas novamente"""
+    path = str(tmp_path / 'state.snap')
+    state = FootballScraper().export_state()
+    state['matches'] = [{'home_team': 'Antigo', 'away_team': 'Jogo', 'league': 'LaLiga'}]
+    state['cache_time'] = time.time() - 10 ** 6
+    save_snapshot(path, state)
+
+    restored = FootballScraper()
+    restored.restore_state(load_snapshot(path))
+
+    assert restored.get_today_matches()[0]['home_team'] != 'Antigo'
+    assert load_snapshot(str(tmp_path / 'inexistente.snap')) is None